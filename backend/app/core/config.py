@@ -1,12 +1,142 @@
+import os
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "auth_scale"
+    # Server processes started by `python -m app.server`, 0 starts one per CPU.
+    # In-memory caches are per process, use the redis backends when running more than one.
+    WORKERS: int = 1
+    HOST: str = "0.0.0.0"
+    PORT: int = 8001
+    # Open connections, exercise validators and the hashing pool before accepting requests
+    WARMUP: bool = True
+    WARMUP_CONNECTIONS: int = 4
+    # Background database check read by the health probes
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 5
+    HEALTH_PING_TIMEOUT_SECONDS: float = 2
     MONGODB_URL: str
     DB_NAME: str = "auth_scaleDB"
+    # Motor connection pool. The sizes match the driver defaults and are always passed, since pool
+    # utilization is reported against the maximum; the optional settings are only passed when set.
+    MONGODB_MAX_POOL_SIZE: int = 100
+    MONGODB_MIN_POOL_SIZE: int = 0
+    MONGODB_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGODB_CONNECT_TIMEOUT_MS: Optional[int] = None
+    MONGODB_SOCKET_TIMEOUT_MS: Optional[int] = None
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: Optional[int] = None
+    # Comma separated, e.g. "zstd,snappy,zlib"
+    MONGODB_COMPRESSORS: Optional[str] = None
+    # "create" builds missing indexes at startup, "verify" only reports them, "off" skips.
+    # Startup fails in every mode if the unique email index is missing.
+    INDEX_MODE: Literal["create", "verify", "off"] = "create"
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # "database" loads the user on every request, "claims" trusts the signed token claims
+    AUTH_MODE: Literal["database", "claims"] = "database"
+    REVOCATION_REFRESH_SECONDS: int = 5
+
+    # Keyset pagination for listings
+    DEFAULT_PAGE_SIZE: int = 100
+    MAX_PAGE_SIZE: int = 500
+    # Cursor batch size for streaming exports
+    EXPORT_BATCH_SIZE: int = 1000
+    # Maximum operations accepted by the bulk task endpoint
+    BULK_MAX_OPERATIONS: int = 500
+
+    # Per-owner task list cache: "memory" (per worker), "redis" (shared) or "off".
+    # Its revisions also back ETags and the principal cache, which are only used with "redis" or a single
+    # worker. Several replicas of one worker each must use "redis" too.
+    TASK_CACHE_BACKEND: Literal["memory", "redis", "off"] = "memory"
+    TASK_CACHE_SIZE: int = 10000
+    TASK_CACHE_TTL_SECONDS: int = 30
+    REDIS_URL: str = "redis://localhost:6379/0"
+    # Cache operations give up after this, a slow or unreachable redis is treated as a cache miss
+    REDIS_TIMEOUT_SECONDS: float = 0.5
+
+    # Logging: records are queued and written by a background thread
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: Literal["color", "json"] = "color"
+    LOG_QUEUE_SIZE: int = 10000
+    # Per-logger cap on records below WARNING, 0 disables
+    LOG_RATE_LIMIT_PER_SECOND: float = 0
+    # Fraction of records below WARNING that are kept
+    LOG_SAMPLE_RATE: float = 1.0
+
+    # Bearer token for the Prometheus scrape endpoint, unset disables it
+    METRICS_TOKEN: Optional[str] = None
+
+    # Request profiling: admins send an X-Profile header, and every Nth request is sampled (0 disables).
+    # Off installs no middleware at all.
+    PROFILING: bool = False
+    PROFILE_SAMPLE_EVERY: int = 0
+    PROFILE_INTERVAL_MS: float = 5
+    # Profiles kept per worker for download, oldest dropped first
+    PROFILE_BUFFER_SIZE: int = 50
+
+    # Password hashing worker pool
+    HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    HASH_WORKERS: int = 4
+    HASH_QUEUE_SIZE: int = 64
+    HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Bulk user import, hashed on a separate pool so logins keep theirs. Workers are per server
+    # process; None shares all but one CPU between the server processes.
+    IMPORT_HASH_EXECUTOR: Literal["thread", "process"] = "process"
+    IMPORT_HASH_WORKERS: Optional[int] = None
+    IMPORT_BATCH_SIZE: int = 500
+    IMPORT_MAX_BYTES: int = 512 * 1024 * 1024
+    # Per-line errors kept in the job result, the counts are always complete
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+
+    # Background jobs, persisted in the jobs collection and run by every worker process
+    JOB_CONCURRENCY: int = 2
+    JOB_MAX_ATTEMPTS: int = 5
+    # Retry delay doubles from this on each failed attempt
+    JOB_RETRY_BASE_SECONDS: float = 2
+    # A running job not finished or extended within the lease is picked up again
+    JOB_LEASE_SECONDS: int = 300
+    JOB_POLL_SECONDS: float = 5
+    JOB_BATCH_SIZE: int = 1000
+    # Finished jobs are removed by a TTL index after this long
+    JOB_RETENTION_SECONDS: int = 7 * 24 * 3600
+
+    # Proxies whose X-Forwarded-For is trusted for the client IP, comma separated addresses or
+    # networks, "*" trusts any. Needed behind a load balancer, or every client shares its IP.
+    # Per IP login throttling is off while unset; set "127.0.0.1" when clients connect directly.
+    TRUSTED_PROXIES: Optional[str] = None
+
+    # Login admission control: token buckets per client IP (only with TRUSTED_PROXIES) and per failing
+    # account (rate 0 disables)
+    LOGIN_RATE_LIMIT_BACKEND: Literal["memory", "redis"] = "memory"
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 100000
+    LOGIN_IP_RATE_PER_MINUTE: float = 60
+    LOGIN_IP_BURST: int = 20
+    LOGIN_ACCOUNT_RATE_PER_MINUTE: float = 10
+    LOGIN_ACCOUNT_BURST: int = 5
+    # Concurrent login verifications per worker (0 disables), leaves hashing capacity for other requests
+    LOGIN_MAX_CONCURRENT_VERIFICATIONS: int = 16
+
+    # Concurrent identical user and task list lookups share one database query. Without shared revisions
+    # (redis), a lookup is only shared until this process writes, writes by other workers can't end it.
+    SINGLE_FLIGHT: bool = True
+
+    # Principal cache for get_current_user (0 disables). Entries are checked against a revision kept in
+    # the task cache backend; with per-process revisions it is only used when running a single worker.
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # Verified JWT payloads keyed by token digest (0 disables)
+    TOKEN_CACHE_SIZE: int = 10000
+
+    def cpu_count(self) -> int:
+        # CPUs this process may run on, which can be fewer than the machine has
+        return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+    def worker_count(self) -> int:
+        return self.WORKERS if self.WORKERS > 0 else self.cpu_count()
 
     model_config = SettingsConfigDict(
         case_sensitive=True,
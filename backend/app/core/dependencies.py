@@ -1,20 +1,49 @@
 from fastapi import Depends, HTTPException, status
+from typing import Optional
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
 from pydantic import ValidationError
 from app.core.config import settings
+from app.core.principal_cache import principal_cache
+from app.core.revocation import revocation_list
+from app.core.single_flight import SingleFlight
+from app.core.security import decode_access_token
+from app.utils.metrics import metrics
 from app.db.mongodb import get_database
-from app.schemas.user import UserResponse
+from app.db.projections import USER_RESPONSE
+from app.schemas.user import UserResponse, UserRole
 from bson import ObjectId
+from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Parallel requests of one client miss the principal cache together, they share the lookup instead
+user_lookups = SingleFlight()
+
+def principal_from_claims(payload: dict) -> Optional[UserResponse]:
+    # Tokens issued before claims-only auth lack these claims and go through the database
+    if "ver" not in payload or "created_at" not in payload:
+        return None
+    # Claims are signed by us, so skip re-validating them
+    return UserResponse.model_construct(
+        id=payload["sub"],
+        name=payload.get("name"),
+        email=payload["email"],
+        role=UserRole(payload["role"]),
+        permissions=payload.get("permissions", []),
+        created_at=datetime.fromisoformat(payload["created_at"]),
+    )
+
 async def get_current_user(token: str = Depends(oauth2_scheme), db = Depends(get_database)) -> UserResponse:
+    with metrics.span("auth"):
+        return await resolve_current_user(token, db)
+
+async def resolve_current_user(token: str, db) -> UserResponse:
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_access_token(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             logger.warning("Token decode failed: Missing sub")
@@ -30,17 +59,48 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db = Depends(get
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-        
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if user is None:
+
+    if settings.AUTH_MODE == "claims":
+        principal = principal_from_claims(payload)
+        if principal is not None:
+            if revocation_list.is_revoked(user_id, payload["ver"]):
+                logger.warning(f"Revoked token used for user ID: {user_id}")
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Could not validate credentials",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            return principal
+
+    cached_user = await principal_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+
+    # Read before the lookup: an update landing while it runs bumps the revision, so the result is
+    # cached under the old one and never served, and later requests don't join this lookup.
+    # Without revisions (per-process ones with several workers) the count of this process's writes
+    # still keeps requests from joining a lookup older than a write they follow.
+    revision = await principal_cache.revision(user_id)
+    current_user = await user_lookups.do(
+        (user_id, revision, principal_cache.local_writes),
+        lambda: load_principal(db, user_id, revision),
+    )
+    if current_user is None:
         logger.warning(f"User not found for ID: {user_id}")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    
+    return current_user
+
+async def load_principal(db, user_id: str, revision: Optional[int]) -> Optional[UserResponse]:
+    user = await db.users.find_one({"_id": ObjectId(user_id)}, USER_RESPONSE)
+    if user is None:
+        return None
     user["_id"] = str(user["_id"])
-    return UserResponse(**user)
+    current_user = UserResponse(**user)
+    principal_cache.set(user_id, revision, current_user)
+    return current_user
 
 async def get_current_active_admin(current_user: UserResponse = Depends(get_current_user)) -> UserResponse:
     if current_user.role != "ADMIN":
@@ -49,5 +109,5 @@ async def get_current_active_admin(current_user: UserResponse = Depends(get_curr
             status_code=status.HTTP_403_FORBIDDEN,
             detail="The user doesn't have enough privileges",
         )
-    logger.info(f"Admin access granted for user: {current_user.email}")
+    logger.info("Admin access granted for user: %s", current_user.email)
     return current_user
@@ -0,0 +1,39 @@
+import hashlib
+from typing import Optional
+from app.core.config import settings
+from app.core.task_cache import cache_backend
+
+class RevisionTracker:
+    """Per-key revision counters for conditional GETs, stored in the task cache backend."""
+
+    def __init__(self, backend, prefix: str):
+        self.backend = backend
+        self.prefix = prefix
+
+    async def current(self, key: str) -> Optional[int]:
+        if self.backend is None:
+            return None
+        return await self.backend.version(f"{self.prefix}:{key}")
+
+    async def bump(self, key: str):
+        if self.backend is not None:
+            await self.backend.bump(f"{self.prefix}:{key}")
+
+user_revisions = RevisionTracker(cache_backend, "user")
+
+# Per-process revisions are numbered independently in each worker, so a tag issued by one worker
+# could match on another that hasn't seen the write. They are only used when there is no other worker.
+ETAGS_ENABLED = cache_backend is not None and (cache_backend.shared or settings.worker_count() == 1)
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags
@@ -0,0 +1,94 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+import bcrypt
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.utils.metrics import metrics
+
+# Module level functions so they can be pickled when running on a process pool
+def _hashpw(password: bytes) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated worker pool so hashing never blocks the event loop.
+    Pending jobs are bounded; once full, callers get a 503 with Retry-After.
+    """
+
+    def __init__(self, workers: int, mode: str = "thread", max_pending: int = 64):
+        self.workers = workers
+        self.mode = mode
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                # Spawned, forking a process with driver and logging threads running isn't safe
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, span: str, fn, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": str(settings.HASH_RETRY_AFTER_SECONDS)},
+            )
+        self.pending += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            elapsed = time.perf_counter() - start
+            # Includes time queued for a worker, which is what the request experiences
+            metrics.observe_span(span, elapsed)
+            self.pending -= 1
+            self.completed += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run("bcrypt_hash", _hashpw, password.encode('utf-8'))
+        return hashed.decode('utf-8')
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run("bcrypt_verify", _checkpw, plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "queue_depth": self.pending,
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_latency_ms": (self.total_seconds / self.completed * 1000) if self.completed else 0.0,
+            "max_latency_ms": self.max_seconds * 1000,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+password_hasher = PasswordHasher(
+    workers=settings.HASH_WORKERS,
+    mode=settings.HASH_EXECUTOR,
+    max_pending=settings.HASH_QUEUE_SIZE,
+)
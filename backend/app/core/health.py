@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.db.mongodb import mongodb
+
+logger = logging.getLogger(__name__)
+
+class HealthMonitor:
+    """
+    Checks the database and worker capacity on an interval in the background, so probes read
+    a cached status instead of each pinging MongoDB. A hung server can't slow probes down,
+    it shows up as a failed, then stale, check.
+    """
+
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self._task: Optional[asyncio.Task] = None
+        self._ping: Optional[asyncio.Future] = None
+        self.accepting = False
+        self.database: Optional[bool] = None
+        self.checked_at: Optional[datetime] = None
+        self.last_success_at: Optional[datetime] = None
+        self.latency_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.consecutive_failures = 0
+        self.pool: dict = {}
+        self.hashing: dict = {}
+
+    async def _ping_database(self):
+        # A ping still waiting on server selection is awaited again rather than stacking another one
+        if self._ping is None or self._ping.done():
+            self._ping = asyncio.ensure_future(mongodb.client.admin.command("ping"))
+        await asyncio.wait_for(asyncio.shield(self._ping), timeout=self.timeout)
+
+    async def check(self):
+        start = time.perf_counter()
+        try:
+            await self._ping_database()
+        except Exception as e:
+            error = "Ping timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+            if self.database is not False:
+                logger.warning(f"Database health check failed: {error}")
+            self.database = False
+            self.last_error = error
+            self.consecutive_failures += 1
+            self.latency_ms = None
+        else:
+            if self.database is False:
+                logger.info("Database health check recovered")
+            self.database = True
+            self.last_error = None
+            self.consecutive_failures = 0
+            self.latency_ms = round((time.perf_counter() - start) * 1000, 3)
+            self.last_success_at = datetime.utcnow()
+        self.checked_at = datetime.utcnow()
+        pool = mongodb.pool_metrics.stats()
+        self.pool = {
+            "checked_out": pool["checked_out"],
+            "max_pool_size": pool["max_pool_size"],
+            "waiting": pool["waiting"],
+            "utilization": pool["utilization"],
+            # Every connection in use and requests queued for one
+            "saturated": pool["checked_out"] >= pool["max_pool_size"] and pool["waiting"] > 0,
+        }
+        self.hashing = {
+            "queue_depth": password_hasher.pending,
+            "max_pending": password_hasher.max_pending,
+            # New hashing work is rejected with a 503 until the queue drains
+            "saturated": password_hasher.pending >= password_hasher.max_pending,
+        }
+
+    async def run(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self.accepting = True
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        # Reported not ready from here on, so the orchestrator stops routing to a worker shutting down
+        self.accepting = False
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stale(self) -> bool:
+        # A monitor that stopped checking can't vouch for the database
+        return self.checked_at is None or datetime.utcnow() - self.checked_at > timedelta(seconds=3 * self.interval + self.timeout)
+
+    def status(self) -> dict:
+        reasons = []
+        if not self.accepting:
+            reasons.append("not_accepting")
+        if self.database is None:
+            reasons.append("database_unchecked")
+        elif not self.database:
+            reasons.append("database_unreachable")
+        if self.database is not None and self.stale():
+            reasons.append("status_stale")
+        if self.pool.get("saturated"):
+            reasons.append("pool_saturated")
+        if self.hashing.get("saturated"):
+            reasons.append("hashing_saturated")
+        return {
+            "ready": not reasons,
+            "reasons": reasons,
+            "database": {
+                "connected": bool(self.database),
+                "checked_at": self.checked_at,
+                "last_success_at": self.last_success_at,
+                "latency_ms": self.latency_ms,
+                "consecutive_failures": self.consecutive_failures,
+                "last_error": self.last_error,
+            },
+            "pool": self.pool,
+            "hashing": self.hashing,
+        }
+
+health_monitor = HealthMonitor(
+    interval=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_PING_TIMEOUT_SECONDS,
+)
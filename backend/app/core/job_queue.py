@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument
+from app.core.config import settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[object, dict], Awaitable[Optional[dict]]]
+
+class JobQueue:
+    """
+    Async job queue persisted in the jobs collection.
+    Every worker process runs `concurrency` consumers that claim jobs with an atomic
+    find_one_and_update, so a job runs once across processes. Claims hold a lease;
+    jobs left running by a crashed or restarted worker are picked up again once it expires.
+    Handlers should therefore be idempotent. Failed jobs are retried with exponential backoff.
+    """
+
+    def __init__(self, concurrency: int, max_attempts: int):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.handlers: dict[str, JobHandler] = {}
+        self._workers: list[asyncio.Task] = []
+        self._local: set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self.worker_id = self._current_worker_id()
+        self.running = 0
+        self.enqueued = 0
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    @staticmethod
+    def _current_worker_id() -> str:
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def handler(self, job_type: str):
+        """Registers the decorated coroutine as the handler of job_type."""
+        def register(fn: JobHandler) -> JobHandler:
+            self.handlers[job_type] = fn
+            return fn
+        return register
+
+    async def enqueue(self, db, job_type: str, payload: dict) -> str:
+        now = datetime.utcnow()
+        result = await db.jobs.insert_one({
+            "type": job_type,
+            "payload": payload,
+            "status": "queued",
+            "attempts": 0,
+            "run_at": now,
+            "created_at": now,
+        })
+        self.enqueued += 1
+        self._wakeup.set()
+        logger.info(f"Enqueued {job_type} job {result.inserted_id}")
+        return str(result.inserted_id)
+
+    async def run_local(self, db, job_type: str, payload: dict, handler: JobHandler) -> str:
+        """
+        Tracks work whose input only exists in this process, such as an uploaded file, as a job.
+        It starts right away and isn't retried. If the process dies the lease runs out
+        and whichever worker claims it next marks it failed.
+        """
+        now = datetime.utcnow()
+        job = {
+            "type": job_type,
+            "payload": payload,
+            "status": "running",
+            "local": True,
+            "attempts": 1,
+            "run_at": now,
+            "created_at": now,
+            "started_at": now,
+            "worker": self.worker_id,
+            "lease_expires_at": now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+        }
+        await db.jobs.insert_one(job)
+        task = asyncio.create_task(self._execute(db, job, handler))
+        self._local.add(task)
+        task.add_done_callback(self._local.discard)
+        return str(job["_id"])
+
+    async def get(self, db, job_id: str) -> Optional[dict]:
+        try:
+            job = await db.jobs.find_one({"_id": ObjectId(job_id)})
+        except InvalidId:
+            return None
+        if job:
+            job["_id"] = str(job["_id"])
+        return job
+
+    async def update_progress(self, db, job_id: ObjectId, progress: dict):
+        """Records handler progress and extends the lease, long jobs should call it between batches."""
+        lease_expires_at = datetime.utcnow() + timedelta(seconds=settings.JOB_LEASE_SECONDS)
+        await db.jobs.update_one(
+            {"_id": job_id, "worker": self.worker_id},
+            {"$set": {"progress": progress, "lease_expires_at": lease_expires_at}},
+        )
+
+    async def _claim(self, db) -> Optional[dict]:
+        now = datetime.utcnow()
+        return await db.jobs.find_one_and_update(
+            {"$or": [
+                {"status": "queued", "run_at": {"$lte": now}},
+                {"status": "running", "lease_expires_at": {"$lt": now}},
+            ]},
+            {
+                "$set": {
+                    "status": "running",
+                    "worker": self.worker_id,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _finish(self, db, job: dict, update: dict):
+        # Only the current lease holder may finish the job
+        await db.jobs.update_one({"_id": job["_id"], "worker": self.worker_id}, update)
+
+    async def _execute(self, db, job: dict, handler: Optional[JobHandler] = None):
+        job_type = job["type"]
+        metrics.observe_span("job_wait", max(0.0, (job["started_at"] - job["run_at"]).total_seconds()))
+        self.running += 1
+        start = time.perf_counter()
+        local = job.get("local", False)
+        if handler is None and not local:
+            handler = self.handlers.get(job_type)
+        try:
+            if handler is None:
+                if local:
+                    raise RuntimeError("Interrupted, the process running this job stopped")
+                raise LookupError(f"No handler registered for job type {job_type}")
+            result = await handler(db, job)
+        except asyncio.CancelledError:
+            if local:
+                await self._finish(db, job, {
+                    "$set": {"status": "failed", "finished_at": datetime.utcnow(), "last_error": "Interrupted by shutdown"},
+                    "$unset": {"lease_expires_at": ""},
+                })
+                raise
+            # Shutting down, hand the job back without counting the attempt
+            await self._finish(db, job, {
+                "$set": {"status": "queued", "run_at": datetime.utcnow()},
+                "$inc": {"attempts": -1},
+                "$unset": {"worker": "", "lease_expires_at": ""},
+            })
+            raise
+        except Exception as e:
+            now = datetime.utcnow()
+            # Local jobs can't be rerun elsewhere and a missing handler won't appear on retry
+            if job["attempts"] < self.max_attempts and handler is not None and not local:
+                delay = settings.JOB_RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1)
+                logger.warning(f"Job {job['_id']} ({job_type}) failed, retrying in {delay:g}s: {str(e)}")
+                self.retried += 1
+                await self._finish(db, job, {
+                    "$set": {"status": "queued", "run_at": now + timedelta(seconds=delay), "last_error": str(e)},
+                    "$unset": {"worker": "", "lease_expires_at": ""},
+                })
+            else:
+                logger.error(f"Job {job['_id']} ({job_type}) failed permanently: {str(e)}")
+                self.failed += 1
+                await self._finish(db, job, {
+                    "$set": {"status": "failed", "finished_at": now, "last_error": str(e)},
+                    "$unset": {"lease_expires_at": ""},
+                })
+        else:
+            self.completed += 1
+            await self._finish(db, job, {
+                "$set": {"status": "done", "finished_at": datetime.utcnow(), "result": result},
+                "$unset": {"lease_expires_at": ""},
+            })
+        finally:
+            self.running -= 1
+            metrics.observe_span(f"job_{job_type}", time.perf_counter() - start)
+
+    async def _consume(self, db):
+        while True:
+            # Cleared before claiming, so an enqueue racing the claim still wakes us up
+            self._wakeup.clear()
+            try:
+                job = await self._claim(db)
+            except Exception as e:
+                logger.warning(f"Claiming a job failed: {str(e)}")
+                job = None
+            if job is not None:
+                try:
+                    await self._execute(db, job)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # Usually the database failing while recording the outcome. The job's lease
+                    # runs out and it is claimed again, this consumer keeps going after a pause.
+                    logger.error(f"Running job {job['_id']} failed: {str(e)}")
+                    await asyncio.sleep(settings.JOB_POLL_SECONDS)
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self, db):
+        # Identifies this process as the lease holder of the jobs it claims
+        self.worker_id = self._current_worker_id()
+        self._wakeup = asyncio.Event()
+        self._workers = [asyncio.create_task(self._consume(db)) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        tasks = self._workers + list(self._local)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+
+    async def depth(self, db) -> int:
+        return await db.jobs.count_documents({"status": "queued"})
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
+
+job_queue = JobQueue(concurrency=settings.JOB_CONCURRENCY, max_attempts=settings.JOB_MAX_ATTEMPTS)
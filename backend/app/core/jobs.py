@@ -0,0 +1,25 @@
+import logging
+from app.core.config import settings
+from app.core.job_queue import job_queue
+from app.core.task_cache import task_list_cache
+from app.repositories.task import TaskRepository
+
+logger = logging.getLogger(__name__)
+
+# Handlers for the background job queue, registered on import
+
+@job_queue.handler("delete_user_tasks")
+async def delete_user_tasks(db, job: dict) -> dict:
+    """Removes a deleted user's tasks in batches, so no single delete holds locks for long."""
+    owner_id = job["payload"]["user_id"]
+    repository = TaskRepository(db)
+    deleted = 0
+    while True:
+        count = await repository.delete_owned_batch(owner_id, settings.JOB_BATCH_SIZE)
+        if not count:
+            break
+        deleted += count
+        await job_queue.update_progress(db, job["_id"], {"deleted": deleted})
+    await task_list_cache.invalidate(owner_id)
+    logger.info(f"Deleted {deleted} tasks of user {owner_id}")
+    return {"deleted": deleted}
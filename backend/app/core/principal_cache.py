@@ -0,0 +1,70 @@
+from typing import Optional
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.etag import RevisionTracker
+from app.core.task_cache import MemoryBackend, cache_backend
+from app.schemas.user import UserResponse
+
+class PrincipalCache:
+    """
+    Already built UserResponse objects keyed by user id, for get_current_user.
+    Each entry remembers the user's revision when it was loaded and only counts while that
+    revision is current. invalidate bumps the revision, so with a shared revision store
+    (redis) a change made on one worker is seen by all of them on their next request.
+    Per-process revisions can't be seen by other workers, so then the cache is only
+    enabled when this is the only worker.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, revisions: RevisionTracker):
+        self.revisions = revisions
+        self.enabled = maxsize > 0 and (revisions.backend.shared or settings.worker_count() == 1)
+        self._entries = TTLCache(maxsize=maxsize if self.enabled else 0, ttl=ttl)
+        self.stale = 0
+        # User writes made by this process, lookups started before one aren't shared after it
+        self.local_writes = 0
+
+    async def revision(self, user_id: str) -> Optional[int]:
+        if not self.enabled:
+            return None
+        return await self.revisions.current(user_id)
+
+    async def get(self, user_id: str) -> Optional[UserResponse]:
+        if not self.enabled:
+            return None
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        revision, principal = entry
+        current = await self.revisions.current(user_id)
+        if current is None:
+            # Revisions unavailable (the cache backend is down), the entry can't be vouched for
+            return None
+        if revision != current:
+            # Changed since it was cached, possibly by another worker
+            self._entries.invalidate(user_id)
+            self.stale += 1
+            return None
+        return principal
+
+    def set(self, user_id: str, revision: Optional[int], principal: UserResponse):
+        if revision is not None:
+            self._entries.set(user_id, (revision, principal))
+
+    async def invalidate(self, user_id: str):
+        """Must be called by any handler that changes or removes a user."""
+        self.local_writes += 1
+        self._entries.invalidate(user_id)
+        await self.revisions.bump(user_id)
+
+    def stats(self) -> dict:
+        return dict(self._entries.stats(), enabled=self.enabled, stale=self.stale)
+
+# Revisions live in the task cache backend, or in this process when that is off
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    revisions=RevisionTracker(
+        cache_backend or MemoryBackend(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS),
+        "principal",
+    ),
+)
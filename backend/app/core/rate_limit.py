@@ -0,0 +1,192 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from fastapi import HTTPException, status
+from app.core.config import settings
+
+# Refills the bucket for the time elapsed since the last take, then, if a token is available,
+# takes cost tokens (0 only checks). Returns {allowed, seconds until a token is available}.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or burst
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+
+class MemoryBuckets:
+    """
+    Per-worker token buckets. Least recently used keys are evicted past maxsize,
+    an evicted bucket simply starts full again.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - last) * rate)
+            if tokens >= 1:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return wait
+
+    async def reset(self, key: str):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "keys": len(self._buckets), "maxsize": self.maxsize}
+
+class RedisBuckets:
+    """Shared buckets for multi-worker deployments, needs the optional redis package."""
+
+    def __init__(self, url: str):
+        try:
+            from redis import asyncio as redis
+        except ImportError:
+            raise RuntimeError("LOGIN_RATE_LIMIT_BACKEND=redis requires the redis package")
+        self._redis = redis.from_url(url)
+        self._script = self._redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        # Wall clock, since it has to agree across workers and hosts
+        allowed, wait = await self._script(keys=[f"ratelimit:{key}"], args=[rate, burst, time.time(), cost])
+        return 0.0 if int(allowed) else float(wait)
+
+    async def reset(self, key: str):
+        await self._redis.delete(f"ratelimit:{key}")
+
+    def stats(self) -> dict:
+        return {"backend": "redis"}
+
+def create_buckets():
+    if settings.LOGIN_RATE_LIMIT_BACKEND == "redis":
+        return RedisBuckets(settings.REDIS_URL)
+    return MemoryBuckets(settings.LOGIN_RATE_LIMIT_MAX_KEYS)
+
+class TokenBucket:
+    """A rate limit of rate_per_minute with bursts of up to burst, applied per key."""
+
+    def __init__(self, buckets, name: str, rate_per_minute: float, burst: int):
+        self.buckets = buckets
+        self.name = name
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self.throttled = 0
+
+    async def take(self, key: str, cost: int = 1) -> float:
+        """Returns 0 if the request is allowed, otherwise the seconds to wait. A cost of 0 only checks."""
+        if self.rate <= 0:
+            return 0.0
+        wait = await self.buckets.take(f"{self.name}:{key}", self.rate, self.burst, cost)
+        if wait:
+            self.throttled += 1
+        return wait
+
+    async def charge(self, key: str):
+        """Takes a token without rejecting anything, for costs only known after the request ran."""
+        if self.rate > 0:
+            await self.buckets.take(f"{self.name}:{key}", self.rate, self.burst)
+
+    async def reset(self, key: str):
+        if self.rate > 0:
+            await self.buckets.reset(f"{self.name}:{key}")
+
+def too_many_requests(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many login attempts, please retry later",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+class LoginThrottle:
+    """
+    Admission control for login. Attempts are checked against per client IP and per account
+    buckets before any database or bcrypt work, and concurrent verifications are capped so a
+    credential stuffing burst can't take all of the hashing capacity. Per IP buckets are only used
+    when TRUSTED_PROXIES is set, since otherwise the address may be a proxy's. Every attempt takes from
+    the IP bucket, the account bucket is only drained by failed verifications and refilled by a
+    successful one, so the owner logging in never uses it up.
+    """
+
+    def __init__(self, buckets, max_concurrent: int):
+        self.buckets = buckets
+        # Without TRUSTED_PROXIES, clients behind a proxy all have its address and would share one bucket
+        self.ip_limited = bool(settings.TRUSTED_PROXIES) and settings.LOGIN_IP_RATE_PER_MINUTE > 0
+        ip_rate = settings.LOGIN_IP_RATE_PER_MINUTE if self.ip_limited else 0
+        self.by_ip = TokenBucket(buckets, "login:ip", ip_rate, settings.LOGIN_IP_BURST)
+        self.by_account = TokenBucket(buckets, "login:account", settings.LOGIN_ACCOUNT_RATE_PER_MINUTE, settings.LOGIN_ACCOUNT_BURST)
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected_busy = 0
+
+    @staticmethod
+    def _account_key(account: str) -> str:
+        return account.strip().lower()
+
+    async def check(self, account: str, client_ip: str):
+        # IP first, so a single source spraying many accounts doesn't drain their buckets
+        wait = await self.by_ip.take(client_ip)
+        if not wait:
+            wait = await self.by_account.take(self._account_key(account), cost=0)
+        if wait:
+            raise too_many_requests(wait)
+        self.admitted += 1
+
+    async def failed(self, account: str):
+        await self.by_account.charge(self._account_key(account))
+
+    async def succeeded(self, account: str):
+        await self.by_account.reset(self._account_key(account))
+
+    @asynccontextmanager
+    async def verification(self):
+        if self.max_concurrent and self.in_flight >= self.max_concurrent:
+            self.rejected_busy += 1
+            raise too_many_requests(settings.HASH_RETRY_AFTER_SECONDS)
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "buckets": self.buckets.stats(),
+            "ip_limited": self.ip_limited,
+            "admitted": self.admitted,
+            "throttled_ip": self.by_ip.throttled,
+            "throttled_account": self.by_account.throttled,
+            "in_flight": self.in_flight,
+            "max_concurrent": self.max_concurrent,
+            "rejected_busy": self.rejected_busy,
+        }
+
+login_throttle = LoginThrottle(create_buckets(), settings.LOGIN_MAX_CONCURRENT_VERIFICATIONS)
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Version used for deleted users, higher than any real token version
+DELETED_TOKEN_VERSION = 2 ** 62
+
+class RevocationList:
+    """
+    Minimum accepted token version per user, used by claims-only auth.
+    Entries are kept in memory for lookups with zero database I/O and mirrored
+    into the token_revocations collection so other workers pick them up on refresh.
+    An entry only needs to live as long as the tokens it revokes.
+    """
+
+    def __init__(self):
+        self._min_versions: dict[str, tuple[int, datetime]] = {}
+
+    def is_revoked(self, user_id: str, token_version: int) -> bool:
+        entry = self._min_versions.get(user_id)
+        if entry is None:
+            return False
+        min_version, expires_at = entry
+        if expires_at <= datetime.utcnow():
+            del self._min_versions[user_id]
+            return False
+        return token_version < min_version
+
+    async def revoke(self, db, user_id: str, min_version: int = DELETED_TOKEN_VERSION):
+        expires_at = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        self._min_versions[user_id] = (min_version, expires_at)
+        await db.token_revocations.update_one(
+            {"user_id": user_id},
+            {"$set": {"min_version": min_version, "expires_at": expires_at}},
+            upsert=True,
+        )
+
+    async def refresh(self, db):
+        now = datetime.utcnow()
+        entries = {}
+        async for doc in db.token_revocations.find({"expires_at": {"$gt": now}}):
+            entries[doc["user_id"]] = (doc["min_version"], doc["expires_at"])
+        self._min_versions = entries
+
+    async def run(self, db, interval: float):
+        while True:
+            try:
+                await self.refresh(db)
+            except Exception as e:
+                logger.warning(f"Token revocation refresh failed: {str(e)}")
+            await asyncio.sleep(interval)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._min_versions)}
+
+revocation_list = RevocationList()
@@ -1,27 +1,49 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Any, Union
 from jose import jwt
-import bcrypt  # Changed from passlib
 from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.cache import TTLCache
 
 # pwd_context removed
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    # bcrypt.checkpw expects bytes
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+# Verified token payloads, each entry expires together with its token
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
 
-def get_password_hash(password: str) -> str:
-    # bcrypt.hashpw returns bytes, we decode to string for storage
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+# Hash of a random throwaway password with the default cost, verified against for unknown
+# emails so a failed login takes the same time whether or not the account exists
+DUMMY_PASSWORD_HASH = "$2b$12$JYI7GA479Sc3G9.mW0nrT.TJXHp5igpU1S8idfjQY0n9.XJsA.OS6"
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    # Runs on the hashing pool so the event loop stays responsive
+    return await password_hasher.verify(plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hasher.hash(password)
 
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None, claims: dict = None) -> str:
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {"exp": expire, "iat": now, "sub": str(subject)}
     if claims:
         to_encode.update(claims)
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
+
+def decode_access_token(token: str) -> dict:
+    # Raises JWTError for invalid tokens, which are never cached
+    key = hashlib.sha256(token.encode('utf-8')).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    exp = payload.get("exp")
+    if exp is not None:
+        token_cache.set(key, payload, ttl=exp - time.time())
+    return payload
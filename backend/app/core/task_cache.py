@@ -0,0 +1,173 @@
+import itertools
+import logging
+from typing import Optional
+from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+class MemoryBackend:
+    """In-process backend, invalidation is only visible to the current worker."""
+
+    shared = False
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._pages = TTLCache(maxsize=maxsize, ttl=ttl)
+        # Versions also expire, bounding how long another worker's writes go unnoticed
+        self._versions = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._sequence = itertools.count(1)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._pages.get(key)
+
+    async def set(self, key: str, value: bytes):
+        self._pages.set(key, value)
+
+    async def version(self, key: str) -> int:
+        version = self._versions.get(key)
+        if version is None:
+            # A fresh sequence value can't match anything cached under an evicted version
+            version = next(self._sequence)
+            self._versions.set(key, version)
+        return version
+
+    async def bump(self, key: str):
+        self._versions.set(key, next(self._sequence))
+
+class RedisBackend:
+    """
+    Shared backend for multi-worker deployments, needs the optional redis package.
+    Redis errors are logged and answered as a miss (a None version), so requests fall through to
+    MongoDB while redis is down. Versions expire like the pages, as in MemoryBackend.
+    """
+
+    shared = True
+
+    def __init__(self, url: str, ttl: int):
+        try:
+            from redis import asyncio as redis
+            from redis.exceptions import RedisError
+        except ImportError:
+            raise RuntimeError("TASK_CACHE_BACKEND=redis requires the redis package")
+        self._redis = redis.from_url(
+            url,
+            socket_timeout=settings.REDIS_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_TIMEOUT_SECONDS,
+        )
+        self._errors = RedisError
+        self.ttl = ttl
+        self.available = True
+        self.failures = 0
+
+    def _failed(self, e: Exception):
+        self.failures += 1
+        if self.available:
+            logger.warning(f"Cache backend unavailable, falling back to the database: {str(e)}")
+        self.available = False
+
+    def _succeeded(self):
+        if not self.available:
+            logger.info("Cache backend recovered")
+        self.available = True
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = await self._redis.get(key)
+        except self._errors as e:
+            self._failed(e)
+            return None
+        self._succeeded()
+        return value
+
+    async def set(self, key: str, value: bytes):
+        try:
+            await self._redis.set(key, value, ex=self.ttl)
+        except self._errors as e:
+            self._failed(e)
+
+    async def version(self, key: str) -> Optional[int]:
+        key = f"version:{key}"
+        try:
+            version = await self._redis.get(key)
+            if version is None:
+                await self._redis.set(key, await self._redis.incr("version:sequence"), nx=True, ex=self.ttl)
+                version = await self._redis.get(key)
+        except self._errors as e:
+            self._failed(e)
+            return None
+        self._succeeded()
+        # None if it expired between the set and the get, the caller skips the cache this once
+        return int(version) if version is not None else None
+
+    async def bump(self, key: str):
+        try:
+            await self._redis.set(f"version:{key}", await self._redis.incr("version:sequence"), ex=self.ttl)
+        except self._errors as e:
+            # Other workers may serve what was cached before this write until it expires
+            logger.error(f"Cache invalidation of {key} failed: {str(e)}")
+            self._failed(e)
+
+class TaskListCache:
+    """
+    Read-through cache of serialized task list pages per owner.
+    Page keys embed the owner's version, so bumping the version invalidates every page at once.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.bumps = 0
+        # Task writes made by this process, lookups started before one aren't shared after it
+        self.local_writes = 0
+
+    async def version(self, owner_id: str) -> Optional[int]:
+        """Current version of the owner's task list, also used as its ETag revision."""
+        if self.backend is None:
+            return None
+        return await self.backend.version(f"tasks:{owner_id}")
+
+    async def get(self, owner_id: str, version: Optional[int], cursor: Optional[str], limit: int) -> Optional[tuple[bytes, Optional[str]]]:
+        if version is None:
+            return None
+        value = await self.backend.get(f"tasks:{owner_id}:{version}:{cursor or ''}:{limit}")
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        next_cursor, payload = value.split(b"\n", 1)
+        return payload, next_cursor.decode('ascii') or None
+
+    async def set(self, owner_id: str, version: Optional[int], cursor: Optional[str], limit: int, payload: bytes, next_cursor: Optional[str]):
+        if version is None:
+            return
+        value = (next_cursor or "").encode('ascii') + b"\n" + payload
+        await self.backend.set(f"tasks:{owner_id}:{version}:{cursor or ''}:{limit}", value)
+
+    async def invalidate(self, owner_id: str):
+        self.local_writes += 1
+        if self.backend is None:
+            return
+        self.bumps += 1
+        await self.backend.bump(f"tasks:{owner_id}")
+
+    def stats(self) -> dict:
+        return {
+            "backend": settings.TASK_CACHE_BACKEND,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bumps": self.bumps,
+        }
+
+def create_backend():
+    if settings.TASK_CACHE_BACKEND == "redis":
+        return RedisBackend(settings.REDIS_URL, settings.TASK_CACHE_TTL_SECONDS)
+    if settings.TASK_CACHE_BACKEND == "memory":
+        return MemoryBackend(settings.TASK_CACHE_SIZE, settings.TASK_CACHE_TTL_SECONDS)
+    return None
+
+cache_backend = create_backend()
+task_list_cache = TaskListCache(cache_backend)
+# Page queries keyed like the cache pages, so a version bump starts a fresh query
+task_list_lookups = SingleFlight()
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from bson import ObjectId
+from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.security import DUMMY_PASSWORD_HASH, create_access_token, decode_access_token
+from app.db.indexes import INDEXES
+from app.schemas.task import TaskResponse
+from app.schemas.user import UserResponse
+from app.utils.serialization import dump_json, trusted_documents
+
+logger = logging.getLogger(__name__)
+
+async def open_connections(db):
+    # Concurrent commands each check out a connection, growing the pool up front
+    await asyncio.gather(*(db.command("ping") for _ in range(max(1, settings.WARMUP_CONNECTIONS))))
+
+async def touch_indexes(db):
+    # Reading through each index pulls its top pages into the server's cache
+    for collection, indexes in INDEXES.items():
+        for index in indexes:
+            await db[collection].find({}, {"_id": 1}).hint(index.document["name"]).limit(1).to_list(length=1)
+
+async def compile_models(db):
+    # First validation and serialization of a schema is much slower than the ones after it
+    now = datetime.utcnow()
+    user = {"_id": ObjectId(), "email": "warmup@example.com", "name": "Warmup", "role": "USER", "permissions": [], "created_at": now}
+    task = {"_id": ObjectId(), "title": "Warmup", "description": None, "owner_id": str(user["_id"]), "created_at": now}
+    for model, doc in ((UserResponse, user), (TaskResponse, task)):
+        model(**dict(doc, _id=str(doc["_id"]))).model_dump_json(by_alias=True)
+        dump_json(trusted_documents([doc], model))
+
+async def issue_token(db):
+    decode_access_token(create_access_token(subject="warmup", claims={"role": "USER"}))
+
+async def hash_once(db):
+    # Starts the hashing pool, which for process pools means spawning a worker
+    await password_hasher.verify("warmup", DUMMY_PASSWORD_HASH)
+
+STEPS = {
+    "connections": open_connections,
+    "indexes": touch_indexes,
+    "models": compile_models,
+    "tokens": issue_token,
+    "hashing": hash_once,
+}
+
+async def warmup(db):
+    """Runs each step once before the worker accepts requests. Failures are logged, not raised."""
+    total = time.perf_counter()
+    for name, step in STEPS.items():
+        start = time.perf_counter()
+        try:
+            await step(db)
+        except Exception as e:
+            logger.warning(f"Warmup step {name} failed: {str(e)}")
+            continue
+        logger.info(f"Warmup step {name} took {(time.perf_counter() - start) * 1000:.1f} ms")
+    logger.info(f"Warmup finished in {(time.perf_counter() - total) * 1000:.1f} ms")
@@ -0,0 +1,76 @@
+import logging
+from pymongo import ASCENDING, IndexModel
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Indexes every query path relies on, keyed by collection name
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("created_at", ASCENDING), ("_id", ASCENDING)], name="created_at_id"),
+    ],
+    "tasks": [
+        IndexModel([("owner_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)], name="owner_created_at_id"),
+        IndexModel([("created_at", ASCENDING), ("_id", ASCENDING)], name="created_at_id"),
+    ],
+    "token_revocations": [
+        IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+    "jobs": [
+        IndexModel([("status", ASCENDING), ("run_at", ASCENDING)], name="status_run_at"),
+        IndexModel([("finished_at", ASCENDING)], name="finished_at_ttl", expireAfterSeconds=settings.JOB_RETENTION_SECONDS),
+    ],
+}
+
+# Unique indexes that enforce correctness rather than speed: duplicate emails are only
+# rejected through DuplicateKeyError, so the app must not run without them
+REQUIRED_UNIQUE = {
+    "users": [[("email", ASCENDING)]],
+}
+
+async def check_required_indexes(db):
+    """Raises when a required unique index is missing, under any name."""
+    for collection, required in REQUIRED_UNIQUE.items():
+        existing = await db[collection].index_information()
+        unique_keys = [list(info["key"]) for info in existing.values() if info.get("unique")]
+        for keys in required:
+            if keys not in unique_keys:
+                fields = ", ".join(field for field, _ in keys)
+                raise RuntimeError(
+                    f"Unique index on {collection} ({fields}) is missing, start once with INDEX_MODE=create or create it manually"
+                )
+
+async def missing_indexes(db) -> dict[str, list[IndexModel]]:
+    """
+    Indexes whose keys no existing index covers. Matching on keys rather than names accepts indexes
+    created before these definitions, e.g. the default email_1, which createIndexes would otherwise
+    reject with IndexOptionsConflict since the key is the same under another name.
+    """
+    missing = {}
+    for collection, indexes in INDEXES.items():
+        existing = await db[collection].index_information()
+        existing_keys = [list(info["key"]) for info in existing.values()]
+        models = [index for index in indexes if list(index.document["key"].items()) not in existing_keys]
+        if models:
+            missing[collection] = models
+    return missing
+
+async def ensure_indexes(db, mode: str):
+    """
+    "create" builds any missing index, "verify" only reports missing ones, "off" does neither.
+    Whatever the mode, startup fails without the required unique indexes.
+    """
+    if mode in ("create", "verify"):
+        missing = await missing_indexes(db)
+        for collection, models in missing.items():
+            names = ", ".join(model.document["name"] for model in models)
+            if mode == "create":
+                await db[collection].create_indexes(models)
+                logger.info(f"Created indexes on {collection}: {names}")
+            else:
+                logger.warning(f"Missing indexes on {collection}: {names}")
+        if mode == "create":
+            logger.info("Database indexes ensured.")
+    await check_required_indexes(db)
@@ -1,14 +1,45 @@
+import os
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.core.config import settings
+from app.db.indexes import ensure_indexes
+from app.db.monitoring import CommandMetrics, PoolMetrics
+
+def client_options() -> dict:
+    options = {
+        "maxPoolSize": settings.MONGODB_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGODB_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGODB_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGODB_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGODB_SOCKET_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        "compressors": settings.MONGODB_COMPRESSORS,
+    }
+    return {key: value for key, value in options.items() if value is not None}
 
 class MongoDB:
     client: AsyncIOMotorClient = None
     db = None
 
+    def __init__(self):
+        self.command_metrics = CommandMetrics()
+        self.pool_metrics = PoolMetrics(settings.MONGODB_MAX_POOL_SIZE)
+        self.pid = None
+
     async def connect_to_database(self):
-        self.client = AsyncIOMotorClient(settings.MONGODB_URL)
+        # Every worker process creates its own client. Clients aren't fork-safe, so one
+        # inherited from a parent process is dropped without touching its sockets.
+        if self.client is not None and self.pid == os.getpid():
+            self.client.close()
+        self.pid = os.getpid()
+        self.client = AsyncIOMotorClient(
+            settings.MONGODB_URL,
+            event_listeners=[self.command_metrics, self.pool_metrics],
+            **client_options(),
+        )
         self.db = self.client[settings.DB_NAME]
         print("Connected to MongoDB")
+        await ensure_indexes(self.db, settings.INDEX_MODE)
 
     async def close_database_connection(self):
         if self.client:
@@ -24,6 +55,12 @@ class MongoDB:
         except Exception:
             return False
 
+    def stats(self) -> dict:
+        return {
+            "pool": self.pool_metrics.stats(),
+            "commands": self.command_metrics.stats(),
+        }
+
 mongodb = MongoDB()
 
 async def get_database():
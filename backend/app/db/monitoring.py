@@ -0,0 +1,113 @@
+import threading
+from pymongo import monitoring
+from app.utils.metrics import metrics
+
+class CommandMetrics(monitoring.CommandListener):
+    """Per-command latency and failure counts. Listener callbacks run on pymongo threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.commands: dict[str, dict] = {}
+
+    def _record(self, name: str, duration_micros: int, failed: bool):
+        # Attributed to the calling endpoint, Motor runs commands in a copy of its context
+        metrics.observe_span(f"mongodb_{name}", duration_micros / 1e6)
+        with self._lock:
+            entry = self.commands.get(name)
+            if entry is None:
+                entry = self.commands[name] = {"count": 0, "failures": 0, "total_ms": 0.0, "max_ms": 0.0}
+            duration_ms = duration_micros / 1000
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            if failed:
+                entry["failures"] += 1
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event.command_name, event.duration_micros, failed=False)
+
+    def failed(self, event):
+        self._record(event.command_name, event.duration_micros, failed=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                name: dict(entry, avg_ms=entry["total_ms"] / entry["count"])
+                for name, entry in self.commands.items()
+            }
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool utilization and checkout wait time."""
+
+    def __init__(self, max_pool_size: int):
+        self._lock = threading.Lock()
+        self.max_pool_size = max_pool_size
+        self.open_connections = 0
+        self.checked_out = 0
+        self.waiting = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.open_connections -= 1
+
+    def connection_check_out_started(self, event):
+        with self._lock:
+            self.waiting += 1
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.waiting -= 1
+            self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        wait_ms = (event.duration or 0.0) * 1000
+        with self._lock:
+            self.waiting -= 1
+            self.checked_out += 1
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_pool_size": self.max_pool_size,
+                "open_connections": self.open_connections,
+                "checked_out": self.checked_out,
+                "waiting": self.waiting,
+                "utilization": self.checked_out / self.max_pool_size if self.max_pool_size else 0.0,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "avg_wait_ms": self.total_wait_ms / self.checkouts if self.checkouts else 0.0,
+                "max_wait_ms": self.max_wait_ms,
+            }
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from app.schemas.task import TaskResponse
+from app.schemas.user import UserResponse
+
+def projection_for(model: type[BaseModel], *extra: str) -> dict:
+    """Mongo projection selecting exactly the document keys a schema reads, plus any extra keys."""
+    keys = [field.alias or name for name, field in model.model_fields.items()]
+    return {key: 1 for key in [*keys, *extra]}
+
+TASK_RESPONSE = projection_for(TaskResponse)
+USER_RESPONSE = projection_for(UserResponse)
+# Login needs the hash to verify and the token version for the claims
+USER_LOGIN = projection_for(UserResponse, "hashed_password", "token_version")
+# update_user revokes tokens using the version returned by the update
+USER_UPDATE = projection_for(UserResponse, "token_version")
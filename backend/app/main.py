@@ -1,14 +1,68 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routes.api.v1 import auth, tasks, users, health
+from app.routes.api.v1 import auth, tasks, users, health, internal
 from fastapi.middleware.cors import CORSMiddleware
+from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 from app.core.config import settings
 from app.db.mongodb import mongodb
+from app.core.hashing import password_hasher
+from app.core.rate_limit import login_throttle
+from app.core.health import health_monitor
+from app.core.revocation import revocation_list
+from app.core.warmup import warmup
+from app.core.job_queue import job_queue
+from app.core import jobs  # noqa: F401, registers job handlers
 from app.utils.logger import setup_logging
+from app.utils.user_import import import_hasher
+from app.utils.metrics import MetricsMiddleware
+from app.utils.profiling import ProfilingMiddleware
 
 # Configure Logging using custom utility
-logger = setup_logging()
+logger = setup_logging(
+    level=settings.LOG_LEVEL,
+    json_output=settings.LOG_FORMAT == "json",
+    rate_per_second=settings.LOG_RATE_LIMIT_PER_SECOND,
+    sample_rate=settings.LOG_SAMPLE_RATE,
+    queue_size=settings.LOG_QUEUE_SIZE,
+)
+
+# Database lifecycle
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs in every worker process, requests are only accepted once startup has finished
+    logger.info("Starting up application...")
+    if not login_throttle.ip_limited and settings.LOGIN_IP_RATE_PER_MINUTE > 0:
+        logger.warning(
+            "TRUSTED_PROXIES is not set, so per IP login throttling is off. Set it to the proxy's addresses, "
+            "or to 127.0.0.1 when clients connect directly."
+        )
+    await mongodb.connect_to_database()
+    logger.info("Database connection established.")
+    if settings.WARMUP:
+        await warmup(mongodb.db)
+    job_queue.start(mongodb.db)
+    health_monitor.start()
+    revocation_task = None
+    if settings.AUTH_MODE == "claims":
+        revocation_task = asyncio.create_task(
+            revocation_list.run(mongodb.db, settings.REVOCATION_REFRESH_SECONDS)
+        )
+
+    yield
+
+    logger.info("Shutting down application...")
+    await health_monitor.stop()
+    if revocation_task:
+        revocation_task.cancel()
+    # Running jobs are handed back to the queue before the connection closes
+    await job_queue.stop()
+    await mongodb.close_database_connection()
+    password_hasher.shutdown()
+    import_hasher.shutdown()
+    logger.info("Database connection closed.")
 
-app = FastAPI(title=settings.PROJECT_NAME, redirect_slashes=False)
+app = FastAPI(title=settings.PROJECT_NAME, redirect_slashes=False, lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -17,25 +71,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Profile-Id"],
 )
-
-# Database Events
-@app.on_event("startup")
-async def startup_db_client():
-    logger.info("Starting up application...")
-    await mongodb.connect_to_database()
-    logger.info("Database connection established.")
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    logger.info("Shutting down application...")
-    await mongodb.close_database_connection()
-    logger.info("Database connection closed.")
+if settings.PROFILING:
+    app.add_middleware(ProfilingMiddleware)
+# Outermost, so latency includes every other middleware
+app.add_middleware(MetricsMiddleware)
+if settings.TRUSTED_PROXIES:
+    # Before everything else, so login throttling sees the client behind the proxy
+    app.add_middleware(ProxyHeadersMiddleware, trusted_hosts=settings.TRUSTED_PROXIES)
 
 app.include_router(health.router, prefix="/api/v1", tags=["Health"])
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Auth"])
 app.include_router(tasks.router, prefix="/api/v1/tasks", tags=["Tasks"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
+app.include_router(internal.router, prefix="/api/v1/internal", tags=["Internal"])
 
 @app.get("/")
 async def root():
@@ -0,0 +1,68 @@
+from typing import Optional
+from bson import ObjectId
+from pymongo import ReturnDocument
+from app.db.projections import TASK_RESPONSE
+
+class TaskRepository:
+    """
+    Single round-trip task mutations. Ownership is enforced in the filter,
+    so a None result means the task is missing or belongs to someone else.
+    """
+
+    def __init__(self, db):
+        self.collection = db.tasks
+
+    @staticmethod
+    def _owned_filter(task_id: str, owner_id: Optional[str]) -> dict:
+        query = {"_id": ObjectId(task_id)}
+        if owner_id is not None:
+            query["owner_id"] = owner_id
+        return query
+
+    async def create(self, task_dict: dict) -> dict:
+        # BSON datetimes keep milliseconds only, match what a re-read would return
+        created_at = task_dict["created_at"]
+        task_dict["created_at"] = created_at.replace(microsecond=created_at.microsecond // 1000 * 1000)
+        result = await self.collection.insert_one(task_dict)
+        # insert_one adds _id to the dict, no need to read the document back
+        task_dict["_id"] = str(result.inserted_id)
+        return task_dict
+
+    async def exists(self, task_id: str) -> bool:
+        return await self.collection.count_documents({"_id": ObjectId(task_id)}, limit=1) > 0
+
+    async def update(self, task_id: str, owner_id: Optional[str], update_data: dict) -> Optional[dict]:
+        query = self._owned_filter(task_id, owner_id)
+        if update_data:
+            task = await self.collection.find_one_and_update(
+                query, {"$set": update_data}, projection=TASK_RESPONSE, return_document=ReturnDocument.AFTER
+            )
+        else:
+            task = await self.collection.find_one(query, TASK_RESPONSE)
+        if task:
+            task["_id"] = str(task["_id"])
+        return task
+
+    async def delete(self, task_id: str, owner_id: Optional[str]) -> Optional[dict]:
+        # Callers only need the owner to invalidate caches
+        task = await self.collection.find_one_and_delete(self._owned_filter(task_id, owner_id), projection={"owner_id": 1})
+        if task:
+            task["_id"] = str(task["_id"])
+        return task
+
+    async def owners(self, task_ids: list[ObjectId]) -> dict[ObjectId, str]:
+        cursor = self.collection.find({"_id": {"$in": task_ids}}, {"owner_id": 1})
+        return {task["_id"]: task["owner_id"] async for task in cursor}
+
+    async def delete_owned_batch(self, owner_id: str, batch_size: int) -> int:
+        """Deletes up to batch_size of the owner's tasks, returning how many were removed."""
+        cursor = self.collection.find({"owner_id": owner_id}, {"_id": 1}).limit(batch_size)
+        task_ids = [task["_id"] async for task in cursor]
+        if not task_ids:
+            return 0
+        result = await self.collection.delete_many({"_id": {"$in": task_ids}, "owner_id": owner_id})
+        return result.deleted_count
+
+    async def bulk_write(self, requests: list):
+        # Unordered so one failing item doesn't stop the rest of the batch
+        return await self.collection.bulk_write(requests, ordered=False)
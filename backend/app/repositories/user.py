@@ -0,0 +1,43 @@
+from typing import Optional
+from bson import ObjectId
+from pymongo import ReturnDocument
+from app.db.projections import USER_RESPONSE, USER_UPDATE
+
+class UserRepository:
+    """Single round-trip user mutations returning the resulting document."""
+
+    def __init__(self, db):
+        self.collection = db.users
+
+    async def create(self, user_dict: dict) -> dict:
+        # Raises DuplicateKeyError when the email is already registered
+        # BSON datetimes keep milliseconds only, match what a re-read would return
+        created_at = user_dict["created_at"]
+        user_dict["created_at"] = created_at.replace(microsecond=created_at.microsecond // 1000 * 1000)
+        result = await self.collection.insert_one(user_dict)
+        user_dict["_id"] = str(result.inserted_id)
+        return user_dict
+
+    async def get(self, user_id: str) -> Optional[dict]:
+        user = await self.collection.find_one({"_id": ObjectId(user_id)}, USER_RESPONSE)
+        if user:
+            user["_id"] = str(user["_id"])
+        return user
+
+    async def update(self, user_id: str, update: dict) -> Optional[dict]:
+        query = {"_id": ObjectId(user_id)}
+        if update:
+            user = await self.collection.find_one_and_update(
+                query, update, projection=USER_UPDATE, return_document=ReturnDocument.AFTER
+            )
+        else:
+            user = await self.collection.find_one(query, USER_UPDATE)
+        if user:
+            user["_id"] = str(user["_id"])
+        return user
+
+    async def delete(self, user_id: str) -> Optional[dict]:
+        user = await self.collection.find_one_and_delete({"_id": ObjectId(user_id)}, projection={"_id": 1})
+        if user:
+            user["_id"] = str(user["_id"])
+        return user
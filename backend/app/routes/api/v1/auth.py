@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from app.db.mongodb import get_database
 from app.schemas.user import UserCreate, UserResponse, UserInDB
-from app.core.security import get_password_hash, verify_password, create_access_token
+from app.core.security import get_password_hash_async, verify_password_async, create_access_token, DUMMY_PASSWORD_HASH
+from app.core.config import settings
+from app.core.rate_limit import login_throttle
+from app.repositories.user import UserRepository
+from app.db.projections import USER_LOGIN
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime, timedelta
 import logging
 
@@ -12,31 +17,35 @@ logger = logging.getLogger(__name__)
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user_in: UserCreate, db = Depends(get_database)):
     logger.info(f"Attempting to register user: {user_in.email}")
-    user = await db.users.find_one({"email": user_in.email})
-    if user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
-    
     user_dict = user_in.dict()
-    hashed_password = get_password_hash(user_dict.pop("password"))
+    hashed_password = await get_password_hash_async(user_dict.pop("password"))
     user_dict["hashed_password"] = hashed_password
     user_dict["created_at"] = datetime.utcnow()
     
-    result = await db.users.insert_one(user_dict)
+    try:
+        # Relies on the unique email index instead of a racy pre-check
+        created_user = await UserRepository(db).create(user_dict)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
     
-    # Fetch the created user
-    created_user = await db.users.find_one({"_id": result.inserted_id})
-    created_user["_id"] = str(created_user["_id"])
     return UserResponse(**created_user)
 
 @router.post("/login")
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db = Depends(get_database)):
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db = Depends(get_database)):
     logger.info(f"Login attempt for user: {form_data.username}")
-    user = await db.users.find_one({"email": form_data.username})
-    if not user or not verify_password(form_data.password, user["hashed_password"]):
+    # Throttled attempts are rejected before any database or bcrypt work
+    # request.client is the original client when TRUSTED_PROXIES covers the proxy in front of us
+    await login_throttle.check(form_data.username, request.client.host if request.client else "unknown")
+    user = await db.users.find_one({"email": form_data.username}, USER_LOGIN)
+    hashed_password = user["hashed_password"] if user else DUMMY_PASSWORD_HASH
+    async with login_throttle.verification():
+        verified = await verify_password_async(form_data.password, hashed_password)
+    if not user or not verified:
         logger.warning(f"Failed login attempt for user: {form_data.username}")
+        await login_throttle.failed(form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -44,10 +53,19 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db = Depends(g
         )
     
     logger.info(f"User logged in successfully: {form_data.username}")
-    access_token_expires = timedelta(minutes=30)
+    await login_throttle.succeeded(form_data.username)
+    # Same lifetime the revocation list keeps entries for, so a revoked token can't outlive its entry
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         subject=str(user["_id"]), 
         expires_delta=access_token_expires,
-        claims={"role": user["role"], "name": user.get("name"), "email": user["email"]}
+        claims={
+            "role": user["role"],
+            "name": user.get("name"),
+            "email": user["email"],
+            "permissions": user.get("permissions", []),
+            "created_at": user["created_at"].isoformat(),
+            "ver": user.get("token_version", 0),
+        }
     )
     return {"access_token": access_token, "token_type": "bearer"}
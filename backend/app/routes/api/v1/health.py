@@ -1,12 +1,38 @@
-from fastapi import APIRouter
-from app.db.mongodb import mongodb
+from fastapi import APIRouter, Response, status
+from app.core.health import health_monitor
 
 router = APIRouter()
 
 # Routes
+# Probes only read the status cached by the health monitor, they never touch the database
 @router.get("/health", tags=["Health"])
 async def health_check():
-    is_connected = await mongodb.check_connection()
-    if is_connected:
-        return {"status": "ok", "database": "connected"}
-    return {"status": "error", "database": "disconnected"}
\ No newline at end of file
+    health = health_monitor.status()
+    database = health["database"]
+    if not database["connected"]:
+        overall = "error"
+    elif not health["ready"]:
+        # Includes a stale status: the last check passed but nothing has confirmed it since
+        overall = "degraded"
+    else:
+        overall = "ok"
+    return {
+        "status": overall,
+        "ready": health["ready"],
+        "reasons": health["reasons"],
+        "database": "connected" if database["connected"] else "disconnected",
+        "checked_at": database["checked_at"],
+        "latency_ms": database["latency_ms"],
+    }
+
+@router.get("/health/live", tags=["Health"])
+async def liveness():
+    # Answering at all means the event loop is responsive, restarting won't fix a database outage
+    return {"status": "ok"}
+
+@router.get("/health/ready", tags=["Health"])
+async def readiness(response: Response):
+    health = health_monitor.status()
+    if not health["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return health
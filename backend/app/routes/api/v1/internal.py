@@ -0,0 +1,90 @@
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from app.core.config import settings
+from app.core.dependencies import get_current_active_admin, user_lookups
+from app.core.principal_cache import principal_cache
+from app.core.hashing import password_hasher
+from app.core.job_queue import job_queue
+from app.core.rate_limit import login_throttle
+from app.core.revocation import revocation_list
+from app.core.security import token_cache
+from app.db.mongodb import mongodb, get_database
+from app.core.task_cache import task_list_cache, task_list_lookups
+from app.utils.logger import logging_stats
+from app.utils.user_import import import_hasher
+from app.utils.metrics import metrics
+from app.utils.profiling import profiler
+from app.schemas.user import UserResponse
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def read_metrics(current_user: UserResponse = Depends(get_current_active_admin), db = Depends(get_database)):
+    return {
+        "hashing": password_hasher.stats(),
+        "import_hashing": import_hasher.stats(),
+        "jobs": dict(job_queue.stats(), queue_depth=await job_queue.depth(db)),
+        "login_throttle": login_throttle.stats(),
+        "principal_cache": principal_cache.stats(),
+        "revocations": revocation_list.stats(),
+        "token_cache": token_cache.stats(),
+        "mongodb": mongodb.stats(),
+        "task_cache": task_list_cache.stats(),
+        "single_flight": {
+            "users": user_lookups.stats(),
+            "task_lists": task_list_lookups.stats(),
+        },
+        "logging": logging_stats(),
+        "profiling": profiler.stats(),
+    }
+
+@router.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def read_prometheus_metrics(authorization: Optional[str] = Header(None), db = Depends(get_database)):
+    # Scrapers authenticate with a static token instead of a short-lived user JWT
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not authorization or not hmac.compare_digest(authorization, f"Bearer {settings.METRICS_TOKEN}"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    pool = mongodb.pool_metrics.stats()
+    gauges = {
+        "hash_queue_depth": password_hasher.pending,
+        "login_verifications_in_flight": login_throttle.in_flight,
+        "job_queue_depth": await job_queue.depth(db),
+        "jobs_running": job_queue.running,
+        "mongodb_pool_checked_out": pool["checked_out"],
+        "mongodb_pool_waiting": pool["waiting"],
+        "mongodb_pool_open_connections": pool["open_connections"],
+    }
+    lines = [metrics.render()]
+    for name, value in gauges.items():
+        lines.append(f"# TYPE {name} gauge\n{name} {value}\n")
+    return PlainTextResponse("".join(lines), media_type="text/plain; version=0.0.4")
+
+@router.get("/jobs/{job_id}")
+async def read_job(job_id: str, current_user: UserResponse = Depends(get_current_active_admin), db = Depends(get_database)):
+    job = await job_queue.get(db, job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+@router.get("/profiles")
+async def read_profiles(current_user: UserResponse = Depends(get_current_active_admin)):
+    return profiler.list()
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def download_profile(profile_id: str, current_user: UserResponse = Depends(get_current_active_admin)):
+    # Collapsed stacks, e.g. `flamegraph.pl profile.folded > profile.svg` or open in speedscope
+    collapsed = profiler.collapsed(profile_id)
+    if collapsed is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return PlainTextResponse(
+        collapsed,
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'},
+    )
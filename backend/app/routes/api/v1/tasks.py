@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from typing import List, Optional
 from app.db.mongodb import get_database
-from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse
+from app.schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskBulkRequest, TaskBulkResponse, TaskBulkResult
 from app.schemas.user import UserResponse
 from app.core.dependencies import get_current_user, get_current_active_admin
+from app.core.config import settings
+from app.utils.pagination import paginate
+from app.utils.export import ExportFormat, export_response
+from app.repositories.task import TaskRepository
+from app.db.projections import TASK_RESPONSE
+from app.core.task_cache import task_list_cache, task_list_lookups
+from app.core.etag import ETAGS_ENABLED, make_etag, etag_matches
+from app.utils.serialization import trusted_documents, dump_json, json_response
 from bson import ObjectId
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
 from datetime import datetime
 import logging
 
@@ -18,64 +28,194 @@ async def create_task(task_in: TaskCreate, current_user: UserResponse = Depends(
     task_dict["owner_id"] = current_user.id
     task_dict["created_at"] = datetime.utcnow()
     
-    result = await db.tasks.insert_one(task_dict)
-    
-    created_task = await db.tasks.find_one({"_id": result.inserted_id})
-    created_task["_id"] = str(created_task["_id"])
+    created_task = await TaskRepository(db).create(task_dict)
+    await task_list_cache.invalidate(current_user.id)
     logger.info(f"Task created successfully. ID: {created_task['_id']}")
     return TaskResponse(**created_task)
 
+@router.post("/bulk", response_model=TaskBulkResponse)
+async def bulk_tasks(bulk_in: TaskBulkRequest, current_user: UserResponse = Depends(get_current_user), db = Depends(get_database)):
+    operations = bulk_in.operations
+    if len(operations) > settings.BULK_MAX_OPERATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BULK_MAX_OPERATIONS} operations are allowed per request",
+        )
+    logger.info(f"Bulk task request with {len(operations)} operations for user {current_user.email}")
+    repository = TaskRepository(db)
+    results: list[Optional[TaskBulkResult]] = [None] * len(operations)
+
+    task_ids = {}
+    for index, operation in enumerate(operations):
+        if operation.op == "create":
+            continue
+        if not operation.id or not ObjectId.is_valid(operation.id):
+            results[index] = TaskBulkResult(index=index, op=operation.op, status=400, id=operation.id, detail="Invalid task id")
+        else:
+            task_ids[index] = ObjectId(operation.id)
+
+    # One lookup resolves ownership for every update/delete in the batch
+    owners = await repository.owners(list(set(task_ids.values()))) if task_ids else {}
+
+    requests = []
+    request_indexes = []
+    now = datetime.utcnow()
+    for index, operation in enumerate(operations):
+        if results[index] is not None:
+            continue
+        if operation.op == "create":
+            if operation.data is None or not operation.data.title:
+                results[index] = TaskBulkResult(index=index, op=operation.op, status=400, detail="Title is required")
+                continue
+            task_dict = {
+                "_id": ObjectId(),
+                "title": operation.data.title,
+                "description": operation.data.description,
+                "owner_id": current_user.id,
+                "created_at": now,
+            }
+            requests.append(InsertOne(task_dict))
+            request_indexes.append(index)
+            results[index] = TaskBulkResult(index=index, op=operation.op, status=201, id=str(task_dict["_id"]))
+            continue
+
+        task_id = task_ids[index]
+        owner_id = owners.get(task_id)
+        # Same rules as update_task/delete_task: only admins may delete other users' tasks
+        allowed = owner_id == current_user.id or (operation.op == "delete" and current_user.role == "ADMIN")
+        if owner_id is None:
+            results[index] = TaskBulkResult(index=index, op=operation.op, status=404, id=operation.id, detail="Task not found")
+            continue
+        if not allowed:
+            results[index] = TaskBulkResult(index=index, op=operation.op, status=403, id=operation.id, detail="Not authorized")
+            continue
+
+        # Ownership stays in the filter so a concurrent reassignment can't be overwritten
+        query = {"_id": task_id, "owner_id": owner_id}
+        if operation.op == "update":
+            update_data = operation.data.dict(exclude_unset=True) if operation.data else {}
+            if update_data:
+                requests.append(UpdateOne(query, {"$set": update_data}))
+                request_indexes.append(index)
+        else:
+            requests.append(DeleteOne(query))
+            request_indexes.append(index)
+        results[index] = TaskBulkResult(index=index, op=operation.op, status=200, id=operation.id)
+
+    inserted = modified = deleted = 0
+    if requests:
+        affected_owners = {current_user.id} | {owners[task_ids[index]] for index in request_indexes if index in task_ids}
+        try:
+            result = await repository.bulk_write(requests)
+            inserted, modified, deleted = result.inserted_count, result.modified_count, result.deleted_count
+        except BulkWriteError as e:
+            details = e.details
+            inserted, modified, deleted = details["nInserted"], details["nModified"], details["nRemoved"]
+            for error in details["writeErrors"]:
+                index = request_indexes[error["index"]]
+                logger.warning(f"Bulk task operation {index} failed: {error['errmsg']}")
+                results[index] = TaskBulkResult(index=index, op=operations[index].op, status=500, id=results[index].id, detail="Write failed")
+        for owner_id in affected_owners:
+            await task_list_cache.invalidate(owner_id)
+
+    return TaskBulkResponse(inserted=inserted, modified=modified, deleted=deleted, results=results)
+
 @router.get("/", response_model=List[TaskResponse])
-async def read_tasks(current_user: UserResponse = Depends(get_current_user), db = Depends(get_database)):
-    logger.info(f"Fetching tasks for user: {current_user.email}")
-    tasks = await db.tasks.find({"owner_id": current_user.id}).to_list(length=100)
-    for task in tasks:
-        task["_id"] = str(task["_id"])
-    return [TaskResponse(**task) for task in tasks]
+async def read_tasks(
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserResponse = Depends(get_current_user),
+    db = Depends(get_database)
+):
+    logger.info("Fetching tasks for user: %s", current_user.email)
+    version = await task_list_cache.version(current_user.id)
+    headers = {}
+    if version is not None and ETAGS_ENABLED:
+        headers["ETag"] = make_etag("tasks", current_user.id, version, cursor, limit)
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cached = await task_list_cache.get(current_user.id, version, cursor, limit)
+    if cached:
+        payload, next_cursor = cached
+    else:
+        # Without a version, the count of this process's writes keeps a request from joining a
+        # lookup that started before its own update
+        payload, next_cursor = await task_list_lookups.do(
+            (current_user.id, version, task_list_cache.local_writes, cursor, limit),
+            lambda: load_task_page(db, current_user.id, version, cursor, limit),
+        )
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    # Already serialized, so bypass response_model validation
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+async def load_task_page(db, owner_id: str, version: Optional[int], cursor: Optional[str], limit: int) -> tuple[bytes, Optional[str]]:
+    tasks, next_cursor = await paginate(db.tasks, {"owner_id": owner_id}, cursor, limit, TASK_RESPONSE)
+    payload = dump_json(trusted_documents(tasks, TaskResponse))
+    await task_list_cache.set(owner_id, version, cursor, limit, payload, next_cursor)
+    return payload, next_cursor
 
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(task_id: str, task_in: TaskUpdate, current_user: UserResponse = Depends(get_current_user), db = Depends(get_database)):
     logger.info(f"Updating task {task_id} for user {current_user.email}")
-    task = await db.tasks.find_one({"_id": ObjectId(task_id)})
-    if not task:
-        logger.warning(f"Task not found: {task_id}")
-        raise HTTPException(status_code=404, detail="Task not found")
+    repository = TaskRepository(db)
+    update_data = {k: v for k, v in task_in.dict(exclude_unset=True).items()}
     
-    if task["owner_id"] != current_user.id:
+    updated_task = await repository.update(task_id, current_user.id, update_data)
+    if not updated_task:
+        # Slow path only to tell a missing task from someone else's
+        if not await repository.exists(task_id):
+            logger.warning(f"Task not found: {task_id}")
+            raise HTTPException(status_code=404, detail="Task not found")
         logger.warning(f"Unauthorized update attempt on task {task_id} by user {current_user.email}")
         raise HTTPException(status_code=403, detail="Not authorized to update this task")
     
-    update_data = {k: v for k, v in task_in.dict(exclude_unset=True).items()}
-    
     if update_data:
-        await db.tasks.update_one({"_id": ObjectId(task_id)}, {"$set": update_data})
-        
-    updated_task = await db.tasks.find_one({"_id": ObjectId(task_id)})
-    updated_task["_id"] = str(updated_task["_id"])
+        await task_list_cache.invalidate(current_user.id)
     return TaskResponse(**updated_task)
 
 @router.delete("/{task_id}")
 async def delete_task(task_id: str, current_user: UserResponse = Depends(get_current_user), db = Depends(get_database)):
     logger.info(f"Deleting task {task_id} requested by {current_user.email}")
-    task = await db.tasks.find_one({"_id": ObjectId(task_id)})
-    if not task:
-        logger.warning(f"Task not found: {task_id}")
-        raise HTTPException(status_code=404, detail="Task not found")
-    
+    repository = TaskRepository(db)
     # Allow Admin to delete any task, or User to delete their own
-    if current_user.role != "ADMIN" and task["owner_id"] != current_user.id:
+    owner_id = None if current_user.role == "ADMIN" else current_user.id
+    
+    task = await repository.delete(task_id, owner_id)
+    if not task:
+        if not await repository.exists(task_id):
+            logger.warning(f"Task not found: {task_id}")
+            raise HTTPException(status_code=404, detail="Task not found")
         logger.warning(f"Unauthorized delete attempt on task {task_id} by user {current_user.email}")
         raise HTTPException(status_code=403, detail="Not authorized to delete this task")
         
-    await db.tasks.delete_one({"_id": ObjectId(task_id)})
+    # Admin deletes change another owner's list
+    await task_list_cache.invalidate(task["owner_id"])
     logger.info(f"Task {task_id} deleted successfully")
     return {"message": "Task deleted successfully"}
 
 # Admin only endpoint to view all tasks
 @router.get("/all", response_model=List[TaskResponse])
-async def read_all_tasks(current_user: UserResponse = Depends(get_current_active_admin), db = Depends(get_database)):
+async def read_all_tasks(
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    current_user: UserResponse = Depends(get_current_active_admin),
+    db = Depends(get_database)
+):
     logger.info(f"Admin {current_user.email} fetching all tasks")
-    tasks = await db.tasks.find().to_list(length=100)
-    for task in tasks:
-        task["_id"] = str(task["_id"])
-    return [TaskResponse(**task) for task in tasks]
+    tasks, next_cursor = await paginate(db.tasks, {}, cursor, limit, TASK_RESPONSE)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return json_response(trusted_documents(tasks, TaskResponse), headers=headers)
+
+# Admin only streaming export of all tasks
+@router.get("/export")
+async def export_tasks(
+    format: ExportFormat = "ndjson",
+    current_user: UserResponse = Depends(get_current_active_admin),
+    db = Depends(get_database)
+):
+    logger.info(f"Admin {current_user.email} exporting tasks as {format}")
+    fields = ["_id", "title", "description", "owner_id", "created_at"]
+    return export_response(db.tasks, {}, fields, format, "tasks")
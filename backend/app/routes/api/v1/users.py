@@ -1,10 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from typing import List, Optional
 from app.db.mongodb import get_database
 from app.schemas.user import UserCreate, UserResponse, UserUpdate, UserRole
 from app.core.dependencies import get_current_user, get_current_active_admin
-from app.core.security import get_password_hash
-from bson import ObjectId
+from app.core.principal_cache import principal_cache
+from app.core.security import get_password_hash_async
+from app.core.revocation import revocation_list
+from app.core.config import settings
+from app.utils.pagination import paginate
+from app.utils.export import ExportFormat, export_response
+from app.utils.user_import import UserImport, spool_upload
+from app.utils.serialization import trusted_documents, json_response
+from app.repositories.user import UserRepository
+from app.db.projections import USER_RESPONSE
+from app.core.task_cache import task_list_cache
+from app.core.etag import ETAGS_ENABLED, make_etag, etag_matches, user_revisions
+from app.core.job_queue import job_queue
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime
 import logging
 
@@ -13,16 +25,58 @@ logger = logging.getLogger(__name__)
 
 @router.get("/", response_model=List[UserResponse])
 async def read_users(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
     current_user: UserResponse = Depends(get_current_active_admin),
     db = Depends(get_database)
 ):
     logger.info(f"Admin {current_user.email} fetching users list")
-    users = await db.users.find().skip(skip).limit(limit).to_list(length=limit)
-    for user in users:
-        user["_id"] = str(user["_id"])
-    return [UserResponse(**user) for user in users]
+    users, next_cursor = await paginate(db.users, {}, cursor, limit, USER_RESPONSE)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return json_response(trusted_documents(users, UserResponse), headers=headers)
+
+@router.get("/export")
+async def export_users(
+    format: ExportFormat = "ndjson",
+    current_user: UserResponse = Depends(get_current_active_admin),
+    db = Depends(get_database)
+):
+    logger.info(f"Admin {current_user.email} exporting users as {format}")
+    fields = ["_id", "name", "email", "role", "permissions", "created_at"]
+    return export_response(db.users, {}, fields, format, "users")
+
+@router.post("/import", status_code=status.HTTP_202_ACCEPTED)
+async def import_users(
+    request: Request,
+    format: ExportFormat = "ndjson",
+    current_user: UserResponse = Depends(get_current_active_admin),
+    db = Depends(get_database)
+):
+    """
+    Bulk creates users from an NDJSON or CSV body with the UserCreate fields, or hashed_password
+    instead of password. The upload is processed in the background, poll GET /import/{job_id}.
+    """
+    logger.info(f"Admin {current_user.email} importing users from {format}")
+    upload = await spool_upload(request)
+    try:
+        job_id = await job_queue.run_local(
+            db, "user_import", {"format": format, "admin": current_user.email}, UserImport(upload, format).run
+        )
+    except Exception:
+        upload.close()
+        raise
+    return {"job_id": job_id}
+
+@router.get("/import/{job_id}")
+async def read_import(
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_active_admin),
+    db = Depends(get_database)
+):
+    job = await job_queue.get(db, job_id)
+    if not job or job["type"] != "user_import":
+        raise HTTPException(status_code=404, detail="Import not found")
+    return job
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def create_user_admin(
@@ -31,28 +85,28 @@ async def create_user_admin(
     db = Depends(get_database)
 ):
     logger.info(f"Admin {current_user.email} creating new user: {user_in.email}")
-    user = await db.users.find_one({"email": user_in.email})
-    if user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
-    
     user_dict = user_in.dict()
-    hashed_password = get_password_hash(user_dict.pop("password"))
+    hashed_password = await get_password_hash_async(user_dict.pop("password"))
     user_dict["hashed_password"] = hashed_password
     user_dict["created_at"] = datetime.utcnow()
     # Ensure role is set (defaults to USER in schema if not provided, but Admin can set it)
     
-    result = await db.users.insert_one(user_dict)
+    try:
+        # Relies on the unique email index instead of a racy pre-check
+        created_user = await UserRepository(db).create(user_dict)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
     
-    created_user = await db.users.find_one({"_id": result.inserted_id})
-    created_user["_id"] = str(created_user["_id"])
     return UserResponse(**created_user)
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def read_user(
     user_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: UserResponse = Depends(get_current_user),
     db = Depends(get_database)
 ):
@@ -60,11 +114,17 @@ async def read_user(
     if current_user.role != UserRole.ADMIN and current_user.id != user_id:
          raise HTTPException(status_code=403, detail="Not authorized")
 
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
+    revision = await user_revisions.current(user_id) if ETAGS_ENABLED else None
+    if revision is not None:
+        etag = make_etag("user", user_id, revision)
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+
+    user = await UserRepository(db).get(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
         
-    user["_id"] = str(user["_id"])
     return UserResponse(**user)
 
 @router.put("/{user_id}", response_model=UserResponse)
@@ -75,17 +135,27 @@ async def update_user(
     db = Depends(get_database)
 ):
     logger.info(f"Admin {current_user.email} updating user {user_id}")
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
     update_data = {k: v for k, v in user_in.dict(exclude_unset=True).items()}
     
+    update = {}
     if update_data:
-        await db.users.update_one({"_id": ObjectId(user_id)}, {"$set": update_data})
-        
-    updated_user = await db.users.find_one({"_id": ObjectId(user_id)})
-    updated_user["_id"] = str(updated_user["_id"])
+        update["$set"] = update_data
+    # Role and permission changes invalidate tokens carrying the old claims
+    revokes_tokens = "role" in update_data or "permissions" in update_data
+    if revokes_tokens:
+        update["$inc"] = {"token_version": 1}
+
+    updated_user = await UserRepository(db).update(user_id, update)
+    if not updated_user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    if revokes_tokens:
+        await revocation_list.revoke(db, user_id, updated_user["token_version"])
+
+    if update:
+        await user_revisions.bump(user_id)
+    # Every worker reloads the user on their next request, seeing the new role/permissions
+    await principal_cache.invalidate(user_id)
     return UserResponse(**updated_user)
 
 @router.delete("/{user_id}")
@@ -95,9 +165,14 @@ async def delete_user(
     db = Depends(get_database)
 ):
     logger.info(f"Admin {current_user.email} deleting user {user_id}")
-    user = await db.users.find_one({"_id": ObjectId(user_id)})
+    user = await UserRepository(db).delete(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
         
-    await db.users.delete_one({"_id": ObjectId(user_id)})
-    return {"message": "User deleted successfully"}
+    await principal_cache.invalidate(user_id)
+    await revocation_list.revoke(db, user_id)
+    await task_list_cache.invalidate(user_id)
+    await user_revisions.bump(user_id)
+    # Their tasks can be many, delete them in the background
+    job_id = await job_queue.enqueue(db, "delete_user_tasks", {"user_id": user_id})
+    return {"message": "User deleted successfully", "job_id": job_id}
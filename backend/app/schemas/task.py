@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, BeforeValidator
-from typing import Optional, Annotated
+from pydantic import BaseModel, ConfigDict, Field, BeforeValidator
+from typing import Optional, Annotated, Literal
 from datetime import datetime
 
 PyObjectId = Annotated[str, BeforeValidator(str)]
@@ -19,15 +19,32 @@ class TaskInDB(TaskBase):
     owner_id: str
     created_at: datetime
 
-    class Config:
-        populate_by_name = True
-        json_encoders = {datetime: lambda v: v.isoformat()}
+    model_config = ConfigDict(populate_by_name=True)
 
 class TaskResponse(TaskBase):
     id: PyObjectId = Field(alias="_id")
     owner_id: str
     created_at: datetime
 
-    class Config:
-        populate_by_name = True
-        json_encoders = {datetime: lambda v: v.isoformat()}
+    model_config = ConfigDict(populate_by_name=True)
+
+class TaskBulkOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: Optional[str] = None
+    data: Optional[TaskUpdate] = None
+
+class TaskBulkRequest(BaseModel):
+    operations: list[TaskBulkOperation]
+
+class TaskBulkResult(BaseModel):
+    index: int
+    op: str
+    status: int
+    id: Optional[str] = None
+    detail: Optional[str] = None
+
+class TaskBulkResponse(BaseModel):
+    inserted: int
+    modified: int
+    deleted: int
+    results: list[TaskBulkResult]
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, Field, BeforeValidator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, BeforeValidator, model_validator
 from typing import Optional, Annotated
 from enum import Enum
 from datetime import datetime
@@ -18,6 +18,18 @@ class UserCreate(UserBase):
     password: str
     role: UserRole = UserRole.USER
 
+class UserImportRow(UserBase):
+    """One bulk import line, with either a plain password or an existing bcrypt hash."""
+    password: Optional[str] = None
+    hashed_password: Optional[str] = Field(None, pattern=r"^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$")
+    role: UserRole = UserRole.USER
+
+    @model_validator(mode="after")
+    def check_password(self):
+        if (self.password is None) == (self.hashed_password is None):
+            raise ValueError("Exactly one of password or hashed_password is required")
+        return self
+
 class UserUpdate(BaseModel):
     name: Optional[str] = None
     role: Optional[UserRole] = None
@@ -28,16 +40,12 @@ class UserInDB(UserBase):
     hashed_password: str
     role: UserRole
     created_at: datetime
-    
-    class Config:
-        populate_by_name = True
-        json_encoders = {datetime: lambda v: v.isoformat()}
+
+    model_config = ConfigDict(populate_by_name=True)
 
 class UserResponse(UserBase):
     id: PyObjectId = Field(alias="_id")
     role: UserRole
     created_at: datetime
 
-    class Config:
-        populate_by_name = True
-        json_encoders = {datetime: lambda v: v.isoformat()}
+    model_config = ConfigDict(populate_by_name=True)
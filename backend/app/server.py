@@ -0,0 +1,13 @@
+import uvicorn
+from app.core.config import settings
+
+def main():
+    """
+    Production entrypoint. Each worker is a separate process importing app.main,
+    so it gets its own event loop, Motor client and hashing pool from the lifespan handler.
+    """
+    # The app is passed as an import string so workers import it themselves instead of inheriting it
+    uvicorn.run("app.main:app", host=settings.HOST, port=settings.PORT, workers=settings.worker_count())
+
+if __name__ == "__main__":
+    main()
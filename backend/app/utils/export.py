@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Literal
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return value
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+async def _stream_rows(cursor, fields: list[str], fmt: ExportFormat) -> AsyncIterator[bytes]:
+    """
+    Encodes documents as they arrive from the Motor cursor.
+    Rows are flushed once per batch, so memory stays bounded by the batch size.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(fields)
+    rows = 0
+    async for doc in cursor:
+        values = [_export_value(doc.get(field)) for field in fields]
+        if writer:
+            writer.writerow([";".join(v) if isinstance(v, list) else v for v in values])
+        else:
+            buffer.write(json.dumps(dict(zip(fields, values))))
+            buffer.write("\n")
+        rows += 1
+        if rows >= settings.EXPORT_BATCH_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            rows = 0
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def export_response(collection, query: dict, fields: list[str], fmt: ExportFormat, filename: str) -> StreamingResponse:
+    projection = {field: 1 for field in fields}
+    cursor = collection.find(query, projection).sort("_id", 1).batch_size(settings.EXPORT_BATCH_SIZE)
+    return StreamingResponse(
+        _stream_rows(cursor, fields, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
@@ -1,5 +1,12 @@
+import atexit
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+import threading
+import time
+import orjson
 
 # ASCII colors for console
 RESET_COLOR = "\033[0m"
@@ -9,11 +16,13 @@ RED = "\033[31m"
 CYAN = "\033[36m"
 WHITE = "\033[37m"
 
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 class ColoredFormatter(logging.Formatter):
     """Custom formatter to add colors to log levels for better readability."""
-    
+
     FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    
+
     FORMATS = {
         logging.DEBUG: WHITE + FORMAT + RESET_COLOR,
         logging.INFO: GREEN + FORMAT + RESET_COLOR,
@@ -22,16 +31,108 @@ class ColoredFormatter(logging.Formatter):
         logging.CRITICAL: RED + "\033[1m" + FORMAT + RESET_COLOR,  # Bold Red
     }
 
+    def __init__(self):
+        super().__init__(self.FORMAT, datefmt=DATE_FORMAT)
+        # Built once instead of per record
+        self._formatters = {
+            level: logging.Formatter(fmt, datefmt=DATE_FORMAT) for level, fmt in self.FORMATS.items()
+        }
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno, self.FORMAT)
-        formatter = logging.Formatter(log_fmt, datefmt="%Y-%m-%d %H:%M:%S")
+        formatter = self._formatters.get(record.levelno)
+        if formatter is None:
+            return super().format(record)
         return formatter.format(record)
 
-def setup_logging(level: int = logging.INFO):
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode('utf-8')
+
+class RateLimitFilter(logging.Filter):
+    """
+    Samples and rate limits records below WARNING per logger.
+    Warnings and errors always pass.
+    """
+
+    def __init__(self, rate_per_second: float = 0, sample_rate: float = 1.0):
+        super().__init__()
+        self.rate = rate_per_second
+        # At least one token, or a rate below 1/s could never let a record through
+        self.capacity = max(1.0, rate_per_second)
+        self.sample_rate = sample_rate
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self.sampled_out = 0
+        self.rate_limited = 0
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.sampled_out += 1
+            return False
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(record.name, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.rate)
+            if tokens < 1:
+                self._buckets[record.name] = (tokens, now)
+                self.rate_limited += 1
+                return False
+            self._buckets[record.name] = (tokens - 1, now)
+        return True
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """Hands records to the listener thread, dropping them instead of blocking when the queue is full."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Same process, so only merge the message; formatting happens on the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+_listener = None
+_queue_handler = None
+_rate_limit_filter = None
+
+def setup_logging(
+    level: str = "INFO",
+    json_output: bool = False,
+    rate_per_second: float = 0,
+    sample_rate: float = 1.0,
+    queue_size: int = 10000,
+):
     """
-    Sets up the global logging configuration with colored output.
+    Sets up the global logging configuration with colored (or JSON) output.
+    Records are queued and written by a background thread, so logging never does I/O on the event loop.
     should be called once at application startup.
     """
+    global _listener, _queue_handler, _rate_limit_filter
+
     # Get root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
@@ -39,18 +140,46 @@ def setup_logging(level: int = logging.INFO):
     # Clear existing handlers to prevent duplicate logs (common with uvicorn/fastapi)
     if root_logger.hasHandlers():
         root_logger.handlers.clear()
+    shutdown_logging()
 
-    # Create console handler
+    # Create console handler, only ever called from the listener thread
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
-    
+
     # Apply custom colored formatter
-    console_handler.setFormatter(ColoredFormatter())
-    
+    console_handler.setFormatter(JSONFormatter() if json_output else ColoredFormatter())
+
+    log_queue = queue.Queue(maxsize=queue_size)
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _rate_limit_filter = RateLimitFilter(rate_per_second, sample_rate)
+    _queue_handler.addFilter(_rate_limit_filter)
+    _listener = logging.handlers.QueueListener(log_queue, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
     # Add handler to root logger
-    root_logger.addHandler(console_handler)
-    
-    # Optional: Adjust third-party loggers if they are too noisy
-    # logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+    root_logger.addHandler(_queue_handler)
+
+    # uvicorn configures its loggers with their own stream handlers before the app is imported.
+    # Routed through the root logger instead, so the access log goes through the queue too.
+    for name in UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
 
     return root_logger
+
+def shutdown_logging():
+    """Flushes queued records and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def logging_stats() -> dict:
+    return {
+        "queue_depth": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "dropped": _queue_handler.dropped if _queue_handler else 0,
+        "sampled_out": _rate_limit_filter.sampled_out if _rate_limit_filter else 0,
+        "rate_limited": _rate_limit_filter.rate_limited if _rate_limit_filter else 0,
+    }
@@ -0,0 +1,129 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+# Seconds, Prometheus default buckets with finer resolution at the low end
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# ASGI scope of the request being handled, so spans can be attributed to its endpoint.
+# Motor copies the context into its executor, so driver listeners see it too.
+current_scope: contextvars.ContextVar[Optional[dict]] = contextvars.ContextVar("current_scope", default=None)
+
+def current_handler() -> str:
+    scope = current_scope.get()
+    if scope is None:
+        return "none"
+    # Unmatched paths share one label to keep cardinality bounded
+    return getattr(scope.get("route"), "name", None) or "unmatched"
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+def _labels(labels: dict) -> str:
+    return ",".join(f'{key}="{value}"' for key, value in labels.items())
+
+class MetricsRegistry:
+    """
+    Request and span metrics rendered in the Prometheus text format.
+    Span observations may come from driver threads, hence the lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests: dict[tuple, Histogram] = {}
+        self.responses: dict[tuple, int] = {}
+        self.spans: dict[tuple, Histogram] = {}
+        self.in_flight = 0
+
+    def _observe(self, series: dict, key: tuple, value: float):
+        with self._lock:
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def observe_request(self, method: str, handler: str, status_code: int, seconds: float):
+        self._observe(self.requests, (method, handler), seconds)
+        key = (method, handler, str(status_code))
+        with self._lock:
+            self.responses[key] = self.responses.get(key, 0) + 1
+
+    def observe_span(self, span: str, seconds: float):
+        self._observe(self.spans, (span, current_handler()), seconds)
+
+    @contextmanager
+    def span(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_span(name, time.perf_counter() - start)
+
+    def _render_histograms(self, lines: list, name: str, label_names: tuple, series: dict):
+        lines.append(f"# TYPE {name} histogram")
+        for key, histogram in series.items():
+            labels = _labels(dict(zip(label_names, key)))
+            cumulative = 0
+            for bound, count in zip(BUCKETS, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.total}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            self._render_histograms(lines, "http_request_duration_seconds", ("method", "handler"), self.requests)
+            lines.append("# TYPE http_responses_total counter")
+            for key, count in self.responses.items():
+                labels = _labels(dict(zip(("method", "handler", "status"), key)))
+                lines.append(f"http_responses_total{{{labels}}} {count}")
+            lines.append("# TYPE http_requests_in_flight gauge")
+            lines.append(f"http_requests_in_flight {self.in_flight}")
+            self._render_histograms(lines, "app_span_duration_seconds", ("span", "handler"), self.spans)
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, status and in-flight requests per endpoint."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = current_scope.set(scope)
+        metrics.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.in_flight -= 1
+            metrics.observe_request(scope["method"], current_handler(), status_code, time.perf_counter() - start)
+            current_scope.reset(token)
@@ -0,0 +1,47 @@
+import base64
+from datetime import datetime
+from typing import Optional
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, status
+
+# Stable ordering used by every keyset paginated listing
+SORT = [("created_at", 1), ("_id", 1)]
+
+def encode_cursor(doc: dict) -> str:
+    raw = f"{doc['created_at'].isoformat()}|{doc['_id']}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor: str) -> tuple[datetime, ObjectId]:
+    try:
+        created_at, _id = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split("|")
+        return datetime.fromisoformat(created_at), ObjectId(_id)
+    except (ValueError, InvalidId):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+def keyset_query(query: dict, cursor: Optional[str]) -> dict:
+    """Restricts query to documents strictly after the cursor position."""
+    if not cursor:
+        return query
+    created_at, _id = decode_cursor(cursor)
+    after = {"$or": [
+        {"created_at": {"$gt": created_at}},
+        {"created_at": created_at, "_id": {"$gt": _id}},
+    ]}
+    return {"$and": [query, after]} if query else after
+
+async def paginate(collection, query: dict, cursor: Optional[str], limit: int, projection: Optional[dict] = None) -> tuple[list, Optional[str]]:
+    """
+    Returns one page of documents ordered by (created_at, _id) and the cursor of the next page.
+    Fetches one extra document to know whether another page exists.
+    The projection must keep created_at, which the cursor is built from.
+    """
+    docs = await collection.find(keyset_query(query, cursor), projection).sort(SORT).limit(limit + 1).to_list(length=limit + 1)
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1])
+    return docs, next_cursor
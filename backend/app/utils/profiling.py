@@ -0,0 +1,216 @@
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.dependencies import get_current_active_admin, resolve_current_user
+from app.db.mongodb import mongodb
+from app.utils.metrics import current_handler
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+@lru_cache(maxsize=4096)
+def _location(filename: str) -> str:
+    # Shortest path relative to an import root, e.g. app/core/security.py or jose/jwt.py
+    for root in sorted((os.path.abspath(path) for path in sys.path if path), key=len, reverse=True):
+        if filename.startswith(root + os.sep):
+            return filename[len(root) + 1:]
+    return filename
+
+def _frame_label(code) -> str:
+    # ";" separates frames in the collapsed format, so it can't appear in a label
+    label = f"{code.co_qualname} ({_location(code.co_filename)}:{code.co_firstlineno})"
+    return label.replace(";", ":")
+
+class StackSampler(threading.Thread):
+    """Samples the stack of one thread at a fixed interval, counting identical stacks."""
+
+    def __init__(self, profile_id: str, thread_id: int, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.profile_id = profile_id
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: dict[tuple, int] = {}
+        self.samples = 0
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            # Code objects are cheap to hash, labels are only built when the profile is downloaded
+            key = tuple(reversed(stack))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def finish(self) -> dict[tuple, int]:
+        self._done.set()
+        self.join()
+        return self.stacks
+
+class Profiler:
+    """
+    Statistical profiles of single requests, kept in a bounded ring buffer.
+    The sampler reads the event loop thread's stack, so everything the loop runs while the
+    request is in flight is included, other requests too, and time spent awaiting I/O shows
+    up as the loop waiting in select. One request is profiled at a time.
+    """
+
+    def __init__(self, buffer_size: int, sample_every: int, interval_ms: float):
+        self.buffer_size = buffer_size
+        self.sample_every = sample_every
+        self.interval = interval_ms / 1000
+        self._profiles: "OrderedDict[str, dict]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._requests = 0
+        self.active = False
+        self.captured = 0
+        self.skipped_busy = 0
+        self.denied = 0
+
+    def sampled(self) -> bool:
+        if self.sample_every <= 0:
+            return False
+        self._requests += 1
+        return self._requests % self.sample_every == 0
+
+    def start(self) -> Optional[StackSampler]:
+        if self.active:
+            self.skipped_busy += 1
+            return None
+        self.active = True
+        sampler = StackSampler(f"{os.getpid()}-{next(self._ids)}", threading.get_ident(), self.interval)
+        sampler.start()
+        return sampler
+
+    def finish(self, sampler: StackSampler, scope: dict, trigger: str, status_code: int, started_at: datetime, seconds: float):
+        stacks = sampler.finish()
+        self.active = False
+        self.captured += 1
+        self._profiles[sampler.profile_id] = {
+            "id": sampler.profile_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "handler": current_handler(),
+            "status": status_code,
+            "trigger": trigger,
+            "started_at": started_at,
+            "duration_ms": round(seconds * 1000, 3),
+            "samples": sampler.samples,
+            "stacks": stacks,
+        }
+        while len(self._profiles) > self.buffer_size:
+            self._profiles.popitem(last=False)
+        logger.info(f"Profiled {scope['method']} {scope['path']} as {sampler.profile_id}: {sampler.samples} samples in {seconds * 1000:.1f} ms")
+
+    def list(self) -> list[dict]:
+        return [
+            {key: value for key, value in profile.items() if key != "stacks"}
+            for profile in reversed(self._profiles.values())
+        ]
+
+    def collapsed(self, profile_id: str) -> Optional[str]:
+        """The profile in the collapsed stack format read by flamegraph.pl, speedscope and inferno."""
+        profile = self._profiles.get(profile_id)
+        if profile is None:
+            return None
+        lines = [
+            ";".join(_frame_label(code) for code in stack) + f" {count}"
+            for stack, count in profile["stacks"].items()
+            if stack
+        ]
+        return "\n".join(lines) + "\n"
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.PROFILING,
+            "sample_every": self.sample_every,
+            "buffered": len(self._profiles),
+            "captured": self.captured,
+            "skipped_busy": self.skipped_busy,
+            "denied": self.denied,
+        }
+
+profiler = Profiler(
+    buffer_size=settings.PROFILE_BUFFER_SIZE,
+    sample_every=settings.PROFILE_SAMPLE_EVERY,
+    interval_ms=settings.PROFILE_INTERVAL_MS,
+)
+
+async def _admin_requested(scope: dict) -> bool:
+    """True when the request carries the profile header and an admin's bearer token."""
+    authorization = None
+    requested = False
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            requested = value not in (b"", b"0")
+        elif name == b"authorization":
+            authorization = value.decode("latin-1")
+    if not requested:
+        return False
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        profiler.denied += 1
+        return False
+    try:
+        await get_current_active_admin(await resolve_current_user(token, mongodb.db))
+    except HTTPException:
+        # Not an admin, the request still runs, just without a profile
+        profiler.denied += 1
+        return False
+    return True
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware profiling a request when an admin sends the X-Profile header,
+    or every PROFILE_SAMPLE_EVERY requests. The profile id is returned in X-Profile-Id.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if profiler.sampled():
+            trigger = "sample"
+        elif await _admin_requested(scope):
+            trigger = "header"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        sampler = profiler.start()
+        if sampler is None:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started_at = datetime.utcnow()
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", sampler.profile_id.encode("ascii"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.finish(sampler, scope, trigger, status_code, started_at, time.perf_counter() - start)
@@ -0,0 +1,25 @@
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+@lru_cache(maxsize=None)
+def response_fields(model: type[BaseModel]) -> tuple[tuple[str, Any], ...]:
+    """JSON key and default of every field in a response schema, keys match the Mongo document."""
+    return tuple(
+        (field.alias or name, field.get_default(call_default_factory=True))
+        for name, field in model.model_fields.items()
+    )
+
+def trusted_documents(docs: Iterable[dict], model: type[BaseModel]) -> list[dict]:
+    # Documents were validated on write, so only pick the response fields instead of re-validating
+    fields = response_fields(model)
+    return [{key: doc.get(key, default) for key, default in fields} for doc in docs]
+
+def dump_json(content: Any) -> bytes:
+    # str covers ObjectId, datetimes and enums are handled natively by orjson
+    return orjson.dumps(content, default=str)
+
+def json_response(content: Any, headers: Optional[dict] = None) -> Response:
+    return Response(content=dump_json(content), media_type="application/json", headers=headers)
@@ -0,0 +1,188 @@
+import asyncio
+import csv
+import io
+import itertools
+import json
+import logging
+import tempfile
+from datetime import datetime
+from typing import IO, Iterator, Optional
+from fastapi import HTTPException, Request, status
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from app.core.config import settings
+from app.core.hashing import PasswordHasher
+from app.core.job_queue import job_queue
+from app.schemas.user import UserImportRow
+from app.utils.export import ExportFormat
+
+logger = logging.getLogger(__name__)
+
+def import_hash_workers() -> int:
+    if settings.IMPORT_HASH_WORKERS:
+        return settings.IMPORT_HASH_WORKERS
+    # Every server process has its own pool, so they split the CPUs instead of each taking all of them
+    return max(1, (settings.cpu_count() - 1) // settings.worker_count())
+
+# Separate from the request hashing pool, so an import can't starve logins
+import_hasher = PasswordHasher(
+    workers=import_hash_workers(),
+    mode=settings.IMPORT_HASH_EXECUTOR,
+    max_pending=settings.IMPORT_BATCH_SIZE,
+)
+# Imports are bound by the hashing pool, running two at once in a process wouldn't be faster
+_import_lock = asyncio.Lock()
+
+async def spool_upload(request: Request) -> IO[bytes]:
+    """
+    Streams the request body to a temporary file, keeping memory flat whatever the upload size.
+    Disk writes run in a thread one chunk at a time, so a slow disk doesn't stall the event loop.
+    """
+    upload = await asyncio.to_thread(tempfile.TemporaryFile)
+    size = 0
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.IMPORT_MAX_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Uploads are limited to {settings.IMPORT_MAX_BYTES} bytes",
+                )
+            await asyncio.to_thread(upload.write, chunk)
+        await asyncio.to_thread(upload.seek, 0)
+    except BaseException:
+        upload.close()
+        raise
+    return upload
+
+def _csv_values(row: dict) -> dict:
+    # Empty cells take the schema default, permissions are ";" separated like in the CSV export
+    values = {key: value for key, value in row.items() if key and value not in (None, "")}
+    if "permissions" in values:
+        values["permissions"] = [permission for permission in values["permissions"].split(";") if permission]
+    return values
+
+def read_rows(upload: IO[bytes], fmt: ExportFormat) -> Iterator[tuple[int, Optional[dict], Optional[str]]]:
+    """Yields (line number, values, parse error) for every non-empty line of the upload."""
+    # Undecodable bytes become replacement characters and fail validation on their own line
+    text = io.TextIOWrapper(upload, encoding="utf-8-sig", errors="replace", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, _csv_values(row), None
+        return
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            values = json.loads(line)
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {str(e)}"
+            continue
+        if not isinstance(values, dict):
+            yield line_number, None, "Expected a JSON object"
+            continue
+        yield line_number, values, None
+
+def next_rows(rows: Iterator, count: int) -> list:
+    """Parses up to count rows, read_rows is blocking so this is run in a thread."""
+    return list(itertools.islice(rows, count))
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}" for e in error.errors()
+    )
+
+class UserImport:
+    """
+    Imports users from an uploaded NDJSON or CSV file in batches.
+    Passwords of a batch are hashed in parallel, then the batch is written with one unordered
+    insert_many, so duplicates are reported by the unique email index instead of per-row lookups.
+    """
+
+    def __init__(self, upload: IO[bytes], fmt: ExportFormat):
+        self.upload = upload
+        self.fmt = fmt
+        self.lines = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.errors: list[dict] = []
+
+    def _error(self, line: int, kind: str, detail: str):
+        if kind == "duplicate":
+            self.duplicates += 1
+        else:
+            self.invalid += 1
+        if len(self.errors) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": kind, "detail": detail})
+
+    def progress(self) -> dict:
+        return {"lines": self.lines, "inserted": self.inserted, "duplicates": self.duplicates, "invalid": self.invalid}
+
+    async def _write(self, db, batch: list[tuple[int, UserImportRow]]):
+        hashes = iter(await asyncio.gather(
+            *(import_hasher.hash(row.password) for _, row in batch if row.password is not None)
+        ))
+        created_at = datetime.utcnow()
+        docs = []
+        for _, row in batch:
+            doc = row.model_dump(mode="json", exclude={"password"})
+            doc["hashed_password"] = row.hashed_password or next(hashes)
+            doc["created_at"] = created_at
+            docs.append(doc)
+        try:
+            result = await db.users.insert_many(docs, ordered=False)
+            self.inserted += len(result.inserted_ids)
+        except BulkWriteError as e:
+            self.inserted += e.details["nInserted"]
+            for error in e.details["writeErrors"]:
+                line = batch[error["index"]][0]
+                if error["code"] == 11000:
+                    self._error(line, "duplicate", "Email already registered")
+                else:
+                    self._error(line, "write_failed", error["errmsg"])
+
+    async def _acquire_lock(self, db, job: dict):
+        # The job is already claimed, so its lease has to be kept alive while another import
+        # holds the lock, or a different process would reclaim it and mark this run failed
+        while True:
+            try:
+                await asyncio.wait_for(_import_lock.acquire(), timeout=settings.JOB_LEASE_SECONDS / 3)
+                return
+            except asyncio.TimeoutError:
+                await job_queue.update_progress(db, job["_id"], self.progress())
+
+    async def run(self, db, job: dict) -> dict:
+        try:
+            await self._acquire_lock(db, job)
+            try:
+                rows = read_rows(self.upload, self.fmt)
+                batch = []
+                while chunk := await asyncio.to_thread(next_rows, rows, settings.IMPORT_BATCH_SIZE):
+                    for line, values, error in chunk:
+                        self.lines += 1
+                        if error:
+                            self._error(line, "invalid", error)
+                            continue
+                        try:
+                            batch.append((line, UserImportRow(**values)))
+                        except ValidationError as e:
+                            self._error(line, "invalid", _validation_message(e))
+                            continue
+                        if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                            await self._write(db, batch)
+                            batch = []
+                            await job_queue.update_progress(db, job["_id"], self.progress())
+                if batch:
+                    await self._write(db, batch)
+            finally:
+                _import_lock.release()
+        finally:
+            self.upload.close()
+        logger.info(f"User import {job['_id']} finished: {self.progress()}")
+        return dict(
+            self.progress(),
+            errors=self.errors,
+            errors_truncated=self.duplicates + self.invalid > len(self.errors),
+        )
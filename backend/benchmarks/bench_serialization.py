@@ -0,0 +1,57 @@
+"""
+Compares list endpoint serialization before and after the trusted orjson path.
+
+"before" mirrors the old handlers: TaskResponse(**doc) per document, then FastAPI
+re-validating and serializing the list through response_model.
+"after" picks the response fields from the documents and encodes once with orjson.
+
+Run from backend/:
+    SECRET_KEY=bench MONGODB_URL=mongodb://localhost python -m benchmarks.bench_serialization
+"""
+import timeit
+from datetime import datetime
+from typing import List
+from bson import ObjectId
+from pydantic import TypeAdapter
+from app.schemas.task import TaskResponse
+from app.utils.serialization import trusted_documents, dump_json
+
+PAGE_SIZE = 100
+ITERATIONS = 500
+
+def make_documents() -> list[dict]:
+    owner_id = str(ObjectId())
+    return [
+        {
+            "_id": ObjectId(),
+            "title": f"Task {i}",
+            "description": "Write the quarterly report and send it to the team",
+            "owner_id": owner_id,
+            "created_at": datetime.utcnow(),
+        }
+        for i in range(PAGE_SIZE)
+    ]
+
+def main():
+    docs = make_documents()
+    adapter = TypeAdapter(List[TaskResponse])
+
+    def before():
+        tasks = [dict(doc, _id=str(doc["_id"])) for doc in docs]
+        models = [TaskResponse(**task) for task in tasks]
+        return adapter.dump_json(adapter.validate_python(models), by_alias=True)
+
+    def after():
+        return dump_json(trusted_documents(docs, TaskResponse))
+
+    assert before() == after(), "both paths must produce identical JSON"
+
+    before_seconds = timeit.timeit(before, number=ITERATIONS)
+    after_seconds = timeit.timeit(after, number=ITERATIONS)
+    print(f"page of {PAGE_SIZE} tasks")
+    print(f"before: {ITERATIONS / before_seconds:10.1f} pages/s ({before_seconds / ITERATIONS * 1e3:.3f} ms/page)")
+    print(f"after:  {ITERATIONS / after_seconds:10.1f} pages/s ({after_seconds / ITERATIONS * 1e3:.3f} ms/page)")
+    print(f"speedup: {before_seconds / after_seconds:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Compares python-jose decoding against the verified token cache used by get_current_user.
+
+Run from backend/:
+    SECRET_KEY=bench MONGODB_URL=mongodb://localhost python -m benchmarks.bench_token_decode
+"""
+import timeit
+from jose import jwt
+from app.core.config import settings
+from app.core.security import create_access_token, decode_access_token, token_cache
+
+ITERATIONS = 20000
+
+def main():
+    token = create_access_token(
+        subject="65c0f0f0f0f0f0f0f0f0f0f0",
+        claims={"role": "USER", "name": "Bench", "email": "bench@example.com"},
+    )
+
+    jose_seconds = timeit.timeit(
+        lambda: jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]),
+        number=ITERATIONS,
+    )
+    token_cache.clear()
+    cached_seconds = timeit.timeit(lambda: decode_access_token(token), number=ITERATIONS)
+
+    jose_us = jose_seconds / ITERATIONS * 1e6
+    cached_us = cached_seconds / ITERATIONS * 1e6
+    print(f"python-jose decode: {jose_us:8.2f} us/call")
+    print(f"cached decode:      {cached_us:8.2f} us/call")
+    print(f"saved per request:  {jose_us - cached_us:8.2f} us ({jose_us / cached_us:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,626 @@
+"""
+In-memory stand-in for the parts of the Motor API the app uses, so benchmarks run without a mongod.
+
+Covers find/find_one (with projections, sort, skip, limit and async iteration), inserts, updates
+with the common operators and upserts, find_one_and_update/find_one_and_delete, deletes,
+count_documents, bulk_write and unique indexes raising DuplicateKeyError/BulkWriteError.
+Queries support equality, $eq/$ne/$gt/$gte/$lt/$lte/$in/$nin/$exists, $and and $or.
+
+Equality on _id and on the leading field of any created index is answered from a hash index.
+Sorted queries whose sort matches an ascending index walk that index from the lower bound implied
+by the query, so keyset pages cost about one page of documents. Everything else is a scan.
+Absolute numbers therefore differ from a real server; compare runs against each other, not
+against production. An optional per-operation latency simulates the network round trip,
+which is what query count reductions actually save.
+"""
+import asyncio
+import bisect
+import contextvars
+import heapq
+import itertools
+from collections import Counter
+from typing import Any, Optional
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.operations import DeleteMany, DeleteOne, IndexModel, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+# Set by the load harness to the operation a request belongs to, round trips are counted against it
+current_operation: contextvars.ContextVar[str] = contextvars.ContextVar("current_operation", default="other")
+
+def _clone(doc: dict) -> dict:
+    # Documents are flat apart from lists, so copying those is enough to isolate callers
+    return {key: list(value) if isinstance(value, list) else value for key, value in doc.items()}
+
+def _compare(op: str, value: Any, operand: Any) -> bool:
+    if op == "$eq":
+        return value == operand or (isinstance(value, list) and operand in value)
+    if op == "$ne":
+        return not _compare("$eq", value, operand)
+    if op == "$in":
+        return any(_compare("$eq", value, item) for item in operand)
+    if op == "$nin":
+        return not _compare("$in", value, operand)
+    if value is None:
+        return False
+    try:
+        if op == "$gt":
+            return value > operand
+        if op == "$gte":
+            return value >= operand
+        if op == "$lt":
+            return value < operand
+        if op == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+    raise OperationFailure(f"unsupported query operator {op}")
+
+def compile_query(query: Optional[dict]):
+    """Turns a query document into a predicate over stored documents."""
+    if not query:
+        return lambda doc: True
+    predicates = []
+    for key, condition in query.items():
+        if key == "$and":
+            parts = [compile_query(part) for part in condition]
+            predicates.append(lambda doc, parts=parts: all(part(doc) for part in parts))
+        elif key == "$or":
+            parts = [compile_query(part) for part in condition]
+            predicates.append(lambda doc, parts=parts: any(part(doc) for part in parts))
+        elif isinstance(condition, dict) and condition and all(op.startswith("$") for op in condition):
+            for op, operand in condition.items():
+                if op == "$exists":
+                    predicates.append(lambda doc, key=key, operand=operand: (key in doc) == bool(operand))
+                else:
+                    predicates.append(lambda doc, key=key, op=op, operand=operand: _compare(op, doc.get(key), operand))
+        else:
+            predicates.append(lambda doc, key=key, condition=condition: _compare("$eq", doc.get(key), condition))
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda doc: all(predicate(doc) for predicate in predicates)
+
+def apply_projection(doc: dict, projection) -> dict:
+    if projection is None:
+        return _clone(doc)
+    if isinstance(projection, (list, tuple)):
+        projection = {field: 1 for field in projection}
+    include_id = projection.get("_id", 1)
+    fields = {key: value for key, value in projection.items() if key != "_id"}
+    if fields and any(fields.values()):
+        result = {key: doc[key] for key in fields if key in doc}
+        if include_id and "_id" in doc:
+            result["_id"] = doc["_id"]
+    else:
+        result = {key: value for key, value in doc.items() if key not in fields}
+        if not include_id:
+            result.pop("_id", None)
+    return _clone(result)
+
+def _sort_value(value: Any) -> tuple:
+    # Missing and null sort first, like the server
+    return (value is not None, value)
+
+def _lower_bound(query: Optional[dict], fields: list[str]) -> Optional[tuple]:
+    """
+    Smallest index key a document matching query can have, or None if unbounded.
+    Understands equalities on leading index fields followed by a range on the next one,
+    and the $or of such branches that keyset pagination produces.
+    """
+    if not query:
+        return None
+    bounds = []
+    for key, condition in query.items():
+        if key == "$and":
+            bounds.extend(bound for bound in (_lower_bound(part, fields) for part in condition) if bound)
+        elif key == "$or":
+            branches = [_lower_bound(part, fields) for part in condition]
+            if branches and all(branches):
+                bounds.append(min(branches))
+    prefix = []
+    for field in fields:
+        if field not in query:
+            break
+        condition = query[field]
+        if isinstance(condition, list):
+            break
+        if isinstance(condition, dict):
+            lows = [operand for op, operand in condition.items() if op in ("$gt", "$gte", "$eq")]
+            if lows:
+                prefix.append(_sort_value(max(lows)))
+            break
+        prefix.append(_sort_value(condition))
+    if prefix:
+        bounds.append(tuple(prefix))
+    return max(bounds) if bounds else None
+
+def _normalize_sort(key_or_list, direction: Optional[int] = None) -> list[tuple[str, int]]:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction or 1)]
+    if isinstance(key_or_list, dict):
+        return list(key_or_list.items())
+    return [(key, value) for key, value in key_or_list]
+
+def _sorted(docs, sort: list[tuple[str, int]], limit: Optional[int]) -> list:
+    directions = {direction for _, direction in sort}
+    if len(directions) == 1:
+        key = lambda doc: tuple(_sort_value(doc.get(field)) for field, _ in sort)
+        if limit:
+            select = heapq.nsmallest if directions == {1} else heapq.nlargest
+            return select(limit, docs, key=key)
+        return sorted(docs, key=key, reverse=directions == {-1})
+    docs = list(docs)
+    for field, direction in reversed(sort):
+        docs.sort(key=lambda doc: _sort_value(doc.get(field)), reverse=direction == -1)
+    return docs[:limit] if limit else docs
+
+def _apply_update(doc: dict, update: dict, inserting: bool = False):
+    if not any(key.startswith("$") for key in update):
+        # Replacement document
+        _id = doc["_id"]
+        doc.clear()
+        doc.update(update)
+        doc["_id"] = _id
+        return
+    for op, fields in update.items():
+        for field, value in fields.items():
+            if op == "$set":
+                doc[field] = value
+            elif op == "$setOnInsert":
+                if inserting:
+                    doc[field] = value
+            elif op == "$unset":
+                doc.pop(field, None)
+            elif op == "$inc":
+                doc[field] = doc.get(field, 0) + value
+            elif op == "$push":
+                doc.setdefault(field, []).append(value)
+            elif op == "$addToSet":
+                if value not in doc.setdefault(field, []):
+                    doc[field].append(value)
+            elif op == "$pull":
+                doc[field] = [item for item in doc.get(field, []) if item != value]
+            else:
+                raise OperationFailure(f"unsupported update operator {op}")
+
+class FakeCursor:
+    def __init__(self, collection: "FakeCollection", query: Optional[dict], projection):
+        self.collection = collection
+        self.query = query
+        self.projection = projection
+        self._sort: Optional[list] = None
+        self._skip = 0
+        self._limit = 0
+        self._results: Optional[list] = None
+
+    def sort(self, key_or_list, direction: Optional[int] = None) -> "FakeCursor":
+        self._sort = _normalize_sort(key_or_list, direction)
+        return self
+
+    def skip(self, skip: int) -> "FakeCursor":
+        self._skip = skip
+        return self
+
+    def limit(self, limit: int) -> "FakeCursor":
+        self._limit = limit
+        return self
+
+    def batch_size(self, batch_size: int) -> "FakeCursor":
+        return self
+
+    def hint(self, index) -> "FakeCursor":
+        return self
+
+    async def _execute(self) -> list:
+        if self._results is None:
+            await self.collection.database.client.round_trip("find")
+            wanted = self._skip + self._limit if self._limit else None
+            docs = self.collection._find(self.query, self._sort, wanted)[self._skip:]
+            self._results = [apply_projection(doc, self.projection) for doc in docs]
+        return self._results
+
+    async def to_list(self, length: Optional[int] = None) -> list:
+        results = await self._execute()
+        return results[:length] if length else list(results)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in await self._execute():
+            yield doc
+
+class FakeCollection:
+    def __init__(self, database: "FakeDatabase", name: str):
+        self.database = database
+        self.name = name
+        self._docs: dict[Any, dict] = {}
+        self._indexes: dict[str, dict] = {"_id_": {"key": [("_id", 1)], "v": 2}}
+        # Leading field of each index -> value -> ids, used to avoid scans
+        self._lookup: dict[str, dict[Any, set]] = {}
+        # Unique index name -> key values -> id
+        self._unique: dict[str, dict[tuple, Any]] = {}
+        # Ascending index name -> sorted (key, id) entries
+        self._ordered: dict[str, list] = {"_id_": []}
+
+    # Index maintenance
+
+    def _index_values(self, fields: list[str], doc: dict) -> tuple:
+        return tuple(doc.get(field) for field in fields)
+
+    def _check_unique(self, doc: dict, ignore_id: Any = None):
+        if doc["_id"] in self._docs and doc["_id"] != ignore_id:
+            raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: _id_", 11000)
+        for name, entries in self._unique.items():
+            fields = [field for field, _ in self._indexes[name]["key"]]
+            owner = entries.get(self._index_values(fields, doc))
+            if owner is not None and owner != ignore_id:
+                raise DuplicateKeyError(f"E11000 duplicate key error collection: {self.name} index: {name}", 11000)
+
+    def _index(self, doc: dict):
+        for field, entries in list(self._lookup.items()):
+            value = doc.get(field)
+            if isinstance(value, (list, dict)):
+                # Array values match per element, leave such fields to scans
+                del self._lookup[field]
+                continue
+            entries.setdefault(value, set()).add(doc["_id"])
+        for name, entries in list(self._ordered.items()):
+            key = self._ordered_key(name, doc)
+            if key is None:
+                del self._ordered[name]
+                continue
+            bisect.insort(entries, (key, doc["_id"]))
+        for name, entries in self._unique.items():
+            fields = [field for field, _ in self._indexes[name]["key"]]
+            entries[self._index_values(fields, doc)] = doc["_id"]
+
+    def _unindex(self, doc: dict):
+        for field, entries in self._lookup.items():
+            ids = entries.get(doc.get(field))
+            if ids is not None:
+                ids.discard(doc["_id"])
+                if not ids:
+                    del entries[doc.get(field)]
+        for name, entries in self._ordered.items():
+            entry = (self._ordered_key(name, doc), doc["_id"])
+            position = bisect.bisect_left(entries, entry)
+            if position < len(entries) and entries[position] == entry:
+                del entries[position]
+        for name, entries in self._unique.items():
+            fields = [field for field, _ in self._indexes[name]["key"]]
+            entries.pop(self._index_values(fields, doc), None)
+
+    def _ordered_key(self, name: str, doc: dict) -> Optional[tuple]:
+        values = [doc.get(field) for field, _ in self._indexes[name]["key"]]
+        if any(isinstance(value, (list, dict)) for value in values):
+            return None
+        return tuple(_sort_value(value) for value in values)
+
+    def _candidates(self, query: Optional[dict]):
+        """Documents that may match, from a hash index when possible, None meaning a full scan."""
+        if query:
+            _id = query.get("_id")
+            if _id is not None and not isinstance(_id, dict):
+                return [self._docs[_id]] if _id in self._docs else []
+            if isinstance(_id, dict) and set(_id) == {"$in"}:
+                return [self._docs[value] for value in _id["$in"] if value in self._docs]
+            for field, entries in self._lookup.items():
+                value = query.get(field)
+                if value is not None and not isinstance(value, (dict, list)):
+                    return [self._docs[_id] for _id in entries.get(value, ())]
+        return None
+
+    def _matching(self, query: Optional[dict]):
+        predicate = compile_query(query)
+        candidates = self._candidates(query)
+        if candidates is None:
+            candidates = self._docs.values()
+        return (doc for doc in candidates if predicate(doc))
+
+    def _walk(self, query: Optional[dict], sort: list[tuple[str, int]]):
+        """Matching documents in index order, or None if no ascending index covers the sort."""
+        fields = [field for field, _ in sort]
+        if any(direction != 1 for _, direction in sort):
+            return None
+        for name, entries in self._ordered.items():
+            index_fields = [field for field, _ in self._indexes[name]["key"]]
+            if index_fields[:len(fields)] != fields or any(direction != 1 for _, direction in self._indexes[name]["key"]):
+                continue
+            bound = _lower_bound(query, index_fields)
+            # Bounds are key prefixes while entries are (key, id), compare keys only
+            start = bisect.bisect_left(entries, bound, key=lambda entry: entry[0]) if bound else 0
+            predicate = compile_query(query)
+            docs = (self._docs[entries[position][1]] for position in range(start, len(entries)))
+            return (doc for doc in docs if predicate(doc))
+        return None
+
+    def _find(self, query: Optional[dict], sort: Optional[list], limit: Optional[int]) -> list:
+        if sort and self._candidates(query) is None:
+            docs = self._walk(query, sort)
+            if docs is not None:
+                return list(itertools.islice(docs, limit))
+        docs = self._matching(query)
+        if sort:
+            return _sorted(docs, sort, limit)
+        return list(itertools.islice(docs, limit))
+
+    def _first(self, query: Optional[dict], sort=None) -> Optional[dict]:
+        docs = self._find(query, _normalize_sort(sort) if sort else None, 1)
+        return docs[0] if docs else None
+
+    # Reads
+
+    def find(self, filter: Optional[dict] = None, projection=None, *, sort=None, skip: int = 0, limit: int = 0) -> FakeCursor:
+        cursor = FakeCursor(self, filter, projection)
+        if sort:
+            cursor.sort(sort)
+        return cursor.skip(skip).limit(limit)
+
+    async def find_one(self, filter: Optional[dict] = None, projection=None, *, sort=None) -> Optional[dict]:
+        await self.database.client.round_trip("find_one")
+        doc = self._first(filter, sort)
+        return apply_projection(doc, projection) if doc is not None else None
+
+    async def count_documents(self, filter: dict, *, skip: int = 0, limit: Optional[int] = None) -> int:
+        await self.database.client.round_trip("count_documents")
+        docs = itertools.islice(self._matching(filter), skip, skip + limit if limit else None)
+        return sum(1 for _ in docs)
+
+    async def estimated_document_count(self) -> int:
+        await self.database.client.round_trip("estimated_document_count")
+        return len(self._docs)
+
+    async def distinct(self, key: str, filter: Optional[dict] = None) -> list:
+        await self.database.client.round_trip("distinct")
+        values = []
+        for doc in self._matching(filter):
+            if doc.get(key) not in values:
+                values.append(doc.get(key))
+        return values
+
+    # Writes, without the round trip so bulk operations can share one
+
+    def _insert(self, document: dict) -> Any:
+        document.setdefault("_id", ObjectId())
+        doc = _clone(document)
+        self._check_unique(doc)
+        self._docs[doc["_id"]] = doc
+        self._index(doc)
+        return doc["_id"]
+
+    def _update(self, filter: dict, update: dict, upsert: bool, many: bool) -> dict:
+        matched = modified = 0
+        for doc in list(self._matching(filter)):
+            changed = _clone(doc)
+            _apply_update(changed, update)
+            self._check_unique(changed, ignore_id=doc["_id"])
+            matched += 1
+            if changed != doc:
+                self._unindex(doc)
+                doc.clear()
+                doc.update(changed)
+                self._index(doc)
+                modified += 1
+            if not many:
+                break
+        result = {"n": matched, "nModified": modified}
+        if not matched and upsert:
+            doc = {key: value for key, value in filter.items() if not key.startswith("$") and not isinstance(value, dict)}
+            doc.setdefault("_id", ObjectId())
+            _apply_update(doc, update, inserting=True)
+            result["upserted"] = self._insert(doc)
+            result["n"] = 1
+        return result
+
+    def _delete(self, filter: dict, many: bool) -> int:
+        deleted = 0
+        for doc in list(self._matching(filter)):
+            self._unindex(doc)
+            del self._docs[doc["_id"]]
+            deleted += 1
+            if not many:
+                break
+        return deleted
+
+    async def insert_one(self, document: dict) -> InsertOneResult:
+        await self.database.client.round_trip("insert_one")
+        return InsertOneResult(self._insert(document), True)
+
+    async def insert_many(self, documents, ordered: bool = True) -> InsertManyResult:
+        await self.database.client.round_trip("insert_many")
+        inserted_ids, errors = [], []
+        for index, document in enumerate(documents):
+            try:
+                inserted_ids.append(self._insert(document))
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e), "op": document})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({
+                "writeErrors": errors, "writeConcernErrors": [], "nInserted": len(inserted_ids),
+                "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": [],
+            })
+        return InsertManyResult(inserted_ids, True)
+
+    async def update_one(self, filter: dict, update: dict, upsert: bool = False) -> UpdateResult:
+        await self.database.client.round_trip("update_one")
+        return UpdateResult(self._update(filter, update, upsert, many=False), True)
+
+    async def update_many(self, filter: dict, update: dict, upsert: bool = False) -> UpdateResult:
+        await self.database.client.round_trip("update_many")
+        return UpdateResult(self._update(filter, update, upsert, many=True), True)
+
+    async def replace_one(self, filter: dict, replacement: dict, upsert: bool = False) -> UpdateResult:
+        await self.database.client.round_trip("replace_one")
+        return UpdateResult(self._update(filter, replacement, upsert, many=False), True)
+
+    async def delete_one(self, filter: dict) -> DeleteResult:
+        await self.database.client.round_trip("delete_one")
+        return DeleteResult({"n": self._delete(filter, many=False)}, True)
+
+    async def delete_many(self, filter: dict) -> DeleteResult:
+        await self.database.client.round_trip("delete_many")
+        return DeleteResult({"n": self._delete(filter, many=True)}, True)
+
+    async def find_one_and_update(
+        self, filter: dict, update: dict, projection=None, sort=None, upsert: bool = False,
+        return_document: bool = ReturnDocument.BEFORE,
+    ) -> Optional[dict]:
+        await self.database.client.round_trip("find_one_and_update")
+        doc = self._first(filter, sort)
+        if doc is None:
+            if not upsert:
+                return None
+            result = self._update(filter, update, upsert=True, many=False)
+            return apply_projection(self._docs[result["upserted"]], projection) if return_document else None
+        before = apply_projection(doc, projection)
+        self._update({"_id": doc["_id"]}, update, upsert=False, many=False)
+        return apply_projection(doc, projection) if return_document else before
+
+    async def find_one_and_delete(self, filter: dict, projection=None, sort=None) -> Optional[dict]:
+        await self.database.client.round_trip("find_one_and_delete")
+        doc = self._first(filter, sort)
+        if doc is None:
+            return None
+        self._delete({"_id": doc["_id"]}, many=False)
+        return apply_projection(doc, projection)
+
+    async def bulk_write(self, requests: list, ordered: bool = True) -> BulkWriteResult:
+        await self.database.client.round_trip("bulk_write")
+        counts = {"nInserted": 0, "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0}
+        upserted, errors = [], []
+        for index, request in enumerate(requests):
+            try:
+                if isinstance(request, InsertOne):
+                    self._insert(request._doc)
+                    counts["nInserted"] += 1
+                elif isinstance(request, (UpdateOne, UpdateMany, ReplaceOne)):
+                    result = self._update(request._filter, request._doc, bool(request._upsert), many=isinstance(request, UpdateMany))
+                    if "upserted" in result:
+                        counts["nUpserted"] += 1
+                        upserted.append({"index": index, "_id": result["upserted"]})
+                    else:
+                        counts["nMatched"] += result["n"]
+                        counts["nModified"] += result["nModified"]
+                elif isinstance(request, (DeleteOne, DeleteMany)):
+                    counts["nRemoved"] += self._delete(request._filter, many=isinstance(request, DeleteMany))
+                else:
+                    raise OperationFailure(f"unsupported bulk operation {type(request).__name__}")
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e), "op": request})
+                if ordered:
+                    break
+        result = dict(counts, upserted=upserted, writeErrors=errors, writeConcernErrors=[])
+        if errors:
+            raise BulkWriteError(result)
+        return BulkWriteResult(result, True)
+
+    # Indexes
+
+    async def create_indexes(self, indexes: list[IndexModel]) -> list[str]:
+        await self.database.client.round_trip("create_indexes")
+        names = []
+        for index in indexes:
+            document = dict(index.document)
+            name = document.pop("name")
+            key = list(document.pop("key").items())
+            names.append(name)
+            if name in self._indexes:
+                continue
+            self._indexes[name] = dict(document, key=key, v=2)
+            self._lookup.setdefault(key[0][0], {})
+            if document.get("unique"):
+                self._unique[name] = {}
+            # Rebuild so existing documents are indexed and checked
+            docs = list(self._docs.values())
+            self._lookup = {field: {} for field in self._lookup}
+            self._unique = {unique: {} for unique in self._unique}
+            self._ordered = {ordered: [] for ordered in self._ordered}
+            if all(direction == 1 for _, direction in key):
+                self._ordered[name] = []
+            for doc in docs:
+                if document.get("unique"):
+                    self._check_unique(dict(doc, _id=None))
+                self._index(doc)
+        return names
+
+    async def create_index(self, keys, **kwargs) -> str:
+        names = await self.create_indexes([IndexModel(keys, **kwargs)])
+        return names[0]
+
+    async def index_information(self) -> dict:
+        await self.database.client.round_trip("index_information")
+        return {name: dict(index) for name, index in self._indexes.items()}
+
+    async def drop(self):
+        await self.database.client.round_trip("drop")
+        self.database._collections.pop(self.name, None)
+
+class FakeDatabase:
+    def __init__(self, client: "FakeClient", name: str):
+        self.client = client
+        self.name = name
+        self._collections: dict[str, FakeCollection] = {}
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = FakeCollection(self, name)
+        return collection
+
+    def __getattr__(self, name: str) -> FakeCollection:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def get_collection(self, name: str) -> FakeCollection:
+        return self[name]
+
+    async def list_collection_names(self) -> list[str]:
+        return list(self._collections)
+
+    async def drop_collection(self, name: str):
+        self._collections.pop(name, None)
+
+    async def command(self, command, **kwargs) -> dict:
+        await self.client.round_trip("command")
+        if command == "ping":
+            return {"ok": 1.0}
+        raise OperationFailure(f"unsupported command {command}")
+
+class FakeClient:
+    """Drop-in for AsyncIOMotorClient. latency_ms is awaited once per operation."""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+        self.operations = 0
+        self.commands: Counter = Counter()
+        self.by_operation: Counter = Counter()
+        self._databases: dict[str, FakeDatabase] = {}
+
+    async def round_trip(self, command: str):
+        self.operations += 1
+        self.commands[command] += 1
+        self.by_operation[current_operation.get()] += 1
+        # Always yield, so concurrent requests interleave as they would on a real socket
+        await asyncio.sleep(self.latency)
+
+    def __getitem__(self, name: str) -> FakeDatabase:
+        database = self._databases.get(name)
+        if database is None:
+            database = self._databases[name] = FakeDatabase(self, name)
+        return database
+
+    def __getattr__(self, name: str) -> FakeDatabase:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def get_database(self, name: str) -> FakeDatabase:
+        return self[name]
+
+    def close(self):
+        pass
@@ -0,0 +1,322 @@
+"""
+Load test harness driving the app in-process over ASGI against the in-memory Mongo stand-in.
+
+Scenarios:
+    register_login  concurrent registrations each followed by a login (bcrypt bound)
+    crud_mix        list/create/update/delete mix, one user per worker with seeded tasks
+    admin_listing   admin paging through /tasks/all at each --listing-sizes task count
+
+Every operation reports count, errors, status codes, RPS, p50/p95/p99 latency and the database
+round trips its requests made as JSON. Each scenario also counts round trips per command.
+With --baseline, a previous report is compared per operation.
+
+Needs httpx on top of requirements.txt. Run from backend/:
+    python -m benchmarks.load --output before.json
+    python -m benchmarks.load --scenario crud_mix --concurrency 32 --baseline before.json
+
+Settings come from the environment as usual; the defaults below only fill in what the
+harness needs to import the app and keep throttling and logging out of the measurements.
+"""
+import os
+
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("LOGIN_IP_RATE_PER_MINUTE", "0")
+os.environ.setdefault("LOGIN_ACCOUNT_RATE_PER_MINUTE", "0")
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+import httpx
+from bson import ObjectId
+from app.core.config import settings
+from app.core.security import get_password_hash_async
+from app.db.indexes import ensure_indexes
+from app.db.mongodb import mongodb
+from app.main import app
+from benchmarks.fake_mongo import FakeClient, current_operation
+
+SCENARIOS = ("register_login", "crud_mix", "admin_listing")
+PASSWORD = "bench-password"
+# Settings that change what is being measured, recorded with every report
+REPORTED_SETTINGS = (
+    "AUTH_MODE", "TASK_CACHE_BACKEND", "HASH_EXECUTOR", "HASH_WORKERS", "HASH_QUEUE_SIZE",
+    "LOGIN_MAX_CONCURRENT_VERIFICATIONS", "PRINCIPAL_CACHE_SIZE", "TOKEN_CACHE_SIZE", "DEFAULT_PAGE_SIZE",
+)
+
+def percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    return samples[max(0, math.ceil(q / 100 * len(samples)) - 1)]
+
+class Recorder:
+    """Latency samples and status codes per operation."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, Counter] = defaultdict(Counter)
+        self.errors: Counter = Counter()
+
+    async def request(self, name: str, method: str, url: str, expected: tuple = (200,), **kwargs) -> httpx.Response:
+        # The app runs in this task, so its database round trips are counted against name
+        token = current_operation.set(name)
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        finally:
+            current_operation.reset(token)
+        self.samples[name].append(time.perf_counter() - start)
+        self.statuses[name][response.status_code] += 1
+        if response.status_code not in expected:
+            self.errors[name] += 1
+        return response
+
+    def report(self, duration: float) -> dict:
+        operations = {}
+        database_operations = mongodb.client.by_operation
+        for name, samples in self.samples.items():
+            samples = sorted(samples)
+            operations[name] = {
+                "count": len(samples),
+                "database_operations": database_operations[name],
+                "database_operations_per_request": database_operations[name] / len(samples),
+                "errors": self.errors[name],
+                "statuses": {str(code): count for code, count in sorted(self.statuses[name].items())},
+                "rps": len(samples) / duration,
+                "p50_ms": percentile(samples, 50) * 1000,
+                "p95_ms": percentile(samples, 95) * 1000,
+                "p99_ms": percentile(samples, 99) * 1000,
+                "max_ms": samples[-1] * 1000,
+            }
+        total = sum(len(samples) for samples in self.samples.values())
+        return {
+            "duration_s": duration,
+            "requests": total,
+            "errors": sum(self.errors.values()),
+            "rps": total / duration,
+            "operations": operations,
+        }
+
+async def run_workers(concurrency: int, worker) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return time.perf_counter() - start
+
+async def use_fake_database(latency_ms: float):
+    """Points the app at a fresh in-memory database, standing in for connect_to_database."""
+    mongodb.client = FakeClient(latency_ms=latency_ms)
+    mongodb.db = mongodb.client[settings.DB_NAME]
+    await ensure_indexes(mongodb.db, "create")
+
+async def seed_users(count: int, prefix: str, hashed_password: str, role: str = "USER") -> list[dict]:
+    now = datetime.utcnow().replace(microsecond=0)
+    users = [
+        {
+            "email": f"{prefix}{index}@example.com",
+            "name": f"{prefix} {index}",
+            "role": role,
+            "permissions": [],
+            "hashed_password": hashed_password,
+            "created_at": now + timedelta(milliseconds=index),
+        }
+        for index in range(count)
+    ]
+    await mongodb.db.users.insert_many(users)
+    return users
+
+async def seed_tasks(owner_ids: list[str], count: int) -> list[ObjectId]:
+    now = datetime.utcnow().replace(microsecond=0)
+    tasks = [
+        {
+            "title": f"Task {index}",
+            "description": "Seeded by the benchmark harness",
+            "owner_id": owner_ids[index % len(owner_ids)],
+            "created_at": now + timedelta(milliseconds=index),
+        }
+        for index in range(count)
+    ]
+    await mongodb.db.tasks.insert_many(tasks)
+    return [task["_id"] for task in tasks]
+
+async def login(client: httpx.AsyncClient, email: str) -> dict:
+    response = await client.post("/api/v1/auth/login", data={"username": email, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+async def register_login(client: httpx.AsyncClient, args, hashed_password: str) -> dict:
+    recorder = Recorder(client)
+    counter = itertools.count()
+
+    async def worker(index: int):
+        while (user := next(counter)) < args.users:
+            email = f"storm{user}@example.com"
+            await recorder.request(
+                "register", "POST", "/api/v1/auth/register", expected=(201,),
+                json={"email": email, "password": PASSWORD, "name": f"Storm {user}"},
+            )
+            await recorder.request(
+                "login", "POST", "/api/v1/auth/login",
+                data={"username": email, "password": PASSWORD},
+            )
+
+    return recorder.report(await run_workers(args.concurrency, worker))
+
+async def crud_mix(client: httpx.AsyncClient, args, hashed_password: str) -> dict:
+    users = await seed_users(args.concurrency, "crud", hashed_password)
+    owner_ids = [str(user["_id"]) for user in users]
+    # Tasks are dealt round robin, so owner i holds every task whose index is i modulo the owner count
+    task_ids = await seed_tasks(owner_ids, args.seed_tasks * len(owner_ids))
+    owned = [task_ids[index::len(owner_ids)] for index in range(len(owner_ids))]
+    headers = await asyncio.gather(*(login(client, user["email"]) for user in users))
+    recorder = Recorder(client)
+    counter = itertools.count()
+    operations = ("list", "create", "update", "delete")
+    weights = (50, 20, 20, 10)
+
+    async def worker(index: int):
+        rng = random.Random(args.seed + index)
+        ids = [str(_id) for _id in owned[index]]
+        while next(counter) < args.requests:
+            operation = rng.choices(operations, weights)[0]
+            if operation in ("update", "delete") and not ids:
+                operation = "create"
+            if operation == "list":
+                await recorder.request("list", "GET", "/api/v1/tasks/", headers=headers[index])
+            elif operation == "create":
+                response = await recorder.request(
+                    "create", "POST", "/api/v1/tasks/", expected=(201,), headers=headers[index],
+                    json={"title": f"Task {rng.random()}", "description": "Created by the benchmark harness"},
+                )
+                if response.status_code == 201:
+                    ids.append(response.json()["_id"])
+            elif operation == "update":
+                await recorder.request(
+                    "update", "PUT", f"/api/v1/tasks/{rng.choice(ids)}", headers=headers[index],
+                    json={"title": f"Updated {rng.random()}"},
+                )
+            else:
+                task_id = ids.pop(rng.randrange(len(ids)))
+                await recorder.request("delete", "DELETE", f"/api/v1/tasks/{task_id}", headers=headers[index])
+
+    return recorder.report(await run_workers(args.concurrency, worker))
+
+async def admin_listing(client: httpx.AsyncClient, args, hashed_password: str, size: int) -> dict:
+    admins = await seed_users(1, "admin", hashed_password, role="ADMIN")
+    users = await seed_users(100, "owner", hashed_password)
+    await seed_tasks([str(user["_id"]) for user in users], size)
+    headers = await login(client, admins[0]["email"])
+    recorder = Recorder(client)
+    counter = itertools.count()
+
+    async def worker(index: int):
+        # Each worker walks the whole listing page by page, starting over at the end
+        cursor = None
+        while next(counter) < args.requests:
+            params = {"limit": args.page_size}
+            if cursor:
+                params["cursor"] = cursor
+            response = await recorder.request("page", "GET", "/api/v1/tasks/all", headers=headers, params=params)
+            cursor = response.headers.get("X-Next-Cursor")
+
+    return recorder.report(await run_workers(args.concurrency, worker))
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def compare(report: dict, baseline: dict):
+    """Prints per-operation change against a baseline report to stderr."""
+    print(f"{'operation':<36}{'rps':>22}{'p50 ms':>22}{'p99 ms':>22}", file=sys.stderr)
+    for scenario, result in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(scenario)
+        if not previous:
+            continue
+        for name, current in result["operations"].items():
+            before = previous["operations"].get(name)
+            if not before:
+                continue
+            cells = []
+            for metric in ("rps", "p50_ms", "p99_ms"):
+                change = (current[metric] - before[metric]) / before[metric] * 100 if before[metric] else 0.0
+                cells.append(f"{before[metric]:.1f} -> {current[metric]:.1f} ({change:+.0f}%)")
+            print(f"{scenario + '.' + name:<36}" + "".join(f"{cell:>22}" for cell in cells), file=sys.stderr)
+
+async def run(args) -> dict:
+    # One hash for every seeded account, seeding shouldn't be dominated by bcrypt
+    hashed_password = await get_password_hash_async(PASSWORD)
+    scenarios = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for scenario in args.scenario:
+            sizes = args.listing_sizes if scenario == "admin_listing" else [None]
+            for size in sizes:
+                name = f"{scenario}_{size}" if size else scenario
+                await use_fake_database(args.db_latency_ms)
+                print(f"running {name}...", file=sys.stderr)
+                if size:
+                    scenarios[name] = await admin_listing(client, args, hashed_password, size)
+                elif scenario == "register_login":
+                    scenarios[name] = await register_login(client, args, hashed_password)
+                else:
+                    scenarios[name] = await crud_mix(client, args, hashed_password)
+                # Seeding and other work outside measured requests is included here
+                scenarios[name]["database_operations"] = mongodb.client.operations
+                scenarios[name]["database_commands"] = dict(mongodb.client.commands.most_common())
+    return {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "baseline")},
+            "settings": {key: getattr(settings, key) for key in REPORTED_SETTINGS},
+        },
+        "scenarios": scenarios,
+    }
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="repeatable, defaults to all")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000, help="requests per crud_mix and admin_listing run")
+    parser.add_argument("--users", type=int, default=100, help="accounts created by register_login")
+    parser.add_argument("--seed-tasks", type=int, default=50, help="tasks seeded per crud_mix user")
+    parser.add_argument("--listing-sizes", type=lambda value: [int(size) for size in value.split(",")], default=[10000, 100000])
+    parser.add_argument("--page-size", type=int, default=settings.DEFAULT_PAGE_SIZE)
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="simulated round trip per database operation")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="previous JSON report to compare against")
+    args = parser.parse_args()
+    args.scenario = args.scenario or list(SCENARIOS)
+    return args
+
+def main():
+    args = parse_args()
+    report = asyncio.run(run(args))
+    encoded = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(encoded + "\n")
+    else:
+        print(encoded)
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
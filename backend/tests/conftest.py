@@ -0,0 +1,46 @@
+import asyncio
+import os
+
+# Settings are read at import time, so these must be set before anything imports the app
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.update(
+    WARMUP="false",
+    WORKERS="1",
+    TASK_CACHE_BACKEND="memory",
+    IMPORT_HASH_EXECUTOR="thread",
+    LOGIN_IP_RATE_PER_MINUTE="0",
+)
+
+import httpx
+import pytest
+from benchmarks.fake_mongo import FakeClient
+
+@pytest.fixture
+def fake_db():
+    return FakeClient()["test"]
+
+@pytest.fixture
+def api(monkeypatch):
+    """Runs a scenario against the app, backed by an in-memory fake_mongo client."""
+    import app.db.mongodb
+    monkeypatch.setattr(app.db.mongodb, "AsyncIOMotorClient", lambda *args, **kwargs: FakeClient())
+    from app.main import app as application
+
+    def run(scenario):
+        async def main():
+            async with application.router.lifespan_context(application):
+                transport = httpx.ASGITransport(app=application)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    return await scenario(client)
+        return asyncio.run(main())
+    return run
+
+async def login(client, email: str, admin: bool = False) -> dict:
+    """Registers a user with password "pw" and returns its auth headers."""
+    from app.db.mongodb import mongodb
+    await client.post("/api/v1/auth/register", json={"email": email, "password": "pw", "name": email})
+    if admin:
+        await mongodb.db.users.update_one({"email": email}, {"$set": {"role": "ADMIN"}})
+    response = await client.post("/api/v1/auth/login", data={"username": email, "password": "pw"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -0,0 +1,64 @@
+from bson import ObjectId
+from conftest import login
+from app.core.config import settings
+
+async def create_task(client, headers, title: str) -> str:
+    return (await client.post("/api/v1/tasks/", json={"title": title}, headers=headers)).json()["_id"]
+
+def test_per_item_results(api):
+    async def scenario(client):
+        owner = await login(client, "owner@example.com")
+        other = await login(client, "other@example.com")
+        mine = await create_task(client, owner, "Mine")
+        doomed = await create_task(client, owner, "Doomed")
+        theirs = await create_task(client, other, "Theirs")
+        response = await client.post("/api/v1/tasks/bulk", headers=owner, json={"operations": [
+            {"op": "create", "data": {"title": "New"}},
+            {"op": "create", "data": {"description": "No title"}},
+            {"op": "update", "id": mine, "data": {"title": "Renamed"}},
+            {"op": "delete", "id": doomed},
+            {"op": "update", "id": theirs, "data": {"title": "Hijacked"}},
+            {"op": "delete", "id": theirs},
+            {"op": "delete", "id": str(ObjectId())},
+            {"op": "update", "id": "not-an-id", "data": {"title": "x"}},
+        ]})
+        owned = (await client.get("/api/v1/tasks/", headers=owner)).json()
+        others = (await client.get("/api/v1/tasks/", headers=other)).json()
+        return response.json(), owned, others
+
+    body, owned, others = api(scenario)
+    assert [result["status"] for result in body["results"]] == [201, 400, 200, 200, 403, 403, 404, 400]
+    assert [result["index"] for result in body["results"]] == list(range(8))
+    assert (body["inserted"], body["modified"], body["deleted"]) == (1, 1, 1)
+    # The listing reflects the writes, so the cached page was invalidated
+    assert sorted(task["title"] for task in owned) == ["New", "Renamed"]
+    assert [task["title"] for task in others] == ["Theirs"]
+
+def test_admin_may_delete_but_not_update_other_users_tasks(api):
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", admin=True)
+        user = await login(client, "user@example.com")
+        first = await create_task(client, user, "First")
+        second = await create_task(client, user, "Second")
+        # Cached before the admin's write, which must invalidate the owner's list too
+        await client.get("/api/v1/tasks/", headers=user)
+        response = await client.post("/api/v1/tasks/bulk", headers=admin, json={"operations": [
+            {"op": "update", "id": first, "data": {"title": "Changed"}},
+            {"op": "delete", "id": second},
+        ]})
+        remaining = (await client.get("/api/v1/tasks/", headers=user)).json()
+        return response.json(), remaining
+
+    body, remaining = api(scenario)
+    assert [result["status"] for result in body["results"]] == [403, 200]
+    assert [task["title"] for task in remaining] == ["First"]
+
+def test_operation_limit(api, monkeypatch):
+    monkeypatch.setattr(settings, "BULK_MAX_OPERATIONS", 2)
+
+    async def scenario(client):
+        user = await login(client, "user@example.com")
+        operations = [{"op": "create", "data": {"title": str(i)}} for i in range(3)]
+        return await client.post("/api/v1/tasks/bulk", headers=user, json={"operations": operations})
+
+    assert api(scenario).status_code == 400
@@ -0,0 +1,52 @@
+import pytest
+from app.core import cache
+from app.core.cache import TTLCache
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+def test_entries_expire(clock):
+    entries = TTLCache(maxsize=10, ttl=5)
+    entries.set("a", 1)
+    clock[0] += 4.9
+    assert entries.get("a") == 1
+    clock[0] += 0.1
+    assert entries.get("a") is None
+    assert len(entries) == 0
+    assert entries.stats()["misses"] == 1
+
+def test_shorter_ttl_per_entry_but_never_longer(clock):
+    entries = TTLCache(maxsize=10, ttl=5)
+    entries.set("short", 1, ttl=1)
+    entries.set("long", 2, ttl=60)
+    clock[0] += 2
+    assert entries.get("short") is None
+    assert entries.get("long") == 2
+    clock[0] += 3
+    assert entries.get("long") is None
+
+def test_least_recently_used_is_evicted(clock):
+    entries = TTLCache(maxsize=2, ttl=60)
+    entries.set("a", 1)
+    entries.set("b", 2)
+    assert entries.get("a") == 1
+    entries.set("c", 3)
+    assert entries.get("b") is None
+    assert entries.get("a") == 1
+    assert entries.get("c") == 3
+    assert entries.stats()["evictions"] == 1
+
+def test_maxsize_zero_disables(clock):
+    entries = TTLCache(maxsize=0, ttl=60)
+    entries.set("a", 1)
+    assert entries.get("a") is None
+
+def test_invalidate(clock):
+    entries = TTLCache(maxsize=10, ttl=60)
+    entries.set("a", 1)
+    entries.invalidate("a")
+    entries.invalidate("missing")
+    assert entries.get("a") is None
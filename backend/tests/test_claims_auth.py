@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+from conftest import login
+from app.core.config import settings
+from app.core.revocation import RevocationList
+
+@pytest.fixture
+def claims_mode(monkeypatch):
+    monkeypatch.setattr(settings, "AUTH_MODE", "claims")
+
+async def user_id(email: str) -> str:
+    from app.db.mongodb import mongodb
+    return str((await mongodb.db.users.find_one({"email": email}))["_id"])
+
+def test_role_change_revokes_older_tokens(api, claims_mode):
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", admin=True)
+        user = await login(client, "user@example.com")
+        before = await client.get("/api/v1/users/", headers=user)
+        await client.put(f"/api/v1/users/{await user_id('user@example.com')}", json={"role": "ADMIN"}, headers=admin)
+        old_token = await client.get("/api/v1/users/", headers=user)
+        new_token = await client.get("/api/v1/users/", headers=await login(client, "user@example.com"))
+        return before.status_code, old_token.status_code, new_token.status_code
+
+    assert api(scenario) == (403, 401, 200)
+
+def test_changes_without_new_claims_keep_tokens_valid(api, claims_mode):
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", admin=True)
+        user = await login(client, "user@example.com")
+        await client.put(f"/api/v1/users/{await user_id('user@example.com')}", json={"name": "Renamed"}, headers=admin)
+        return (await client.get("/api/v1/tasks/", headers=user)).status_code
+
+    assert api(scenario) == 200
+
+def test_deletion_revokes_every_token(api, claims_mode):
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", admin=True)
+        user = await login(client, "user@example.com")
+        before = await client.get("/api/v1/tasks/", headers=user)
+        await client.delete(f"/api/v1/users/{await user_id('user@example.com')}", headers=admin)
+        after = await client.get("/api/v1/tasks/", headers=user)
+        return before.status_code, after.status_code
+
+    assert api(scenario) == (200, 401)
+
+def test_revocations_reach_other_workers_on_refresh(fake_db):
+    revoking, other = RevocationList(), RevocationList()
+
+    async def run():
+        await revoking.revoke(fake_db, "user", 3)
+        missed = other.is_revoked("user", 2)
+        await other.refresh(fake_db)
+        return missed, other.is_revoked("user", 2), other.is_revoked("user", 3)
+
+    assert asyncio.run(run()) == (False, True, False)
@@ -0,0 +1,42 @@
+from conftest import login
+from app.core.etag import etag_matches, make_etag
+
+def test_etag_matching():
+    etag = make_etag("tasks", "owner", 1)
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches(make_etag("tasks", "owner", 2), etag)
+
+def test_task_list_etag_changes_after_a_write(api):
+    async def scenario(client):
+        headers = await login(client, "tasks@example.com")
+        first = await client.get("/api/v1/tasks/", headers=headers)
+        etag = first.headers["ETag"]
+        unchanged = await client.get("/api/v1/tasks/", headers=dict(headers, **{"If-None-Match": etag}))
+        await client.post("/api/v1/tasks/", json={"title": "New"}, headers=headers)
+        changed = await client.get("/api/v1/tasks/", headers=dict(headers, **{"If-None-Match": etag}))
+        return unchanged, changed
+
+    unchanged, changed = api(scenario)
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert [task["title"] for task in changed.json()] == ["New"]
+
+def test_user_etag_changes_after_an_update(api):
+    async def scenario(client):
+        from app.db.mongodb import mongodb
+        admin = await login(client, "admin@example.com", admin=True)
+        await login(client, "user@example.com")
+        user_id = str((await mongodb.db.users.find_one({"email": "user@example.com"}))["_id"])
+        etag = (await client.get(f"/api/v1/users/{user_id}", headers=admin)).headers["ETag"]
+        unchanged = await client.get(f"/api/v1/users/{user_id}", headers=dict(admin, **{"If-None-Match": etag}))
+        await client.put(f"/api/v1/users/{user_id}", json={"name": "Renamed"}, headers=admin)
+        changed = await client.get(f"/api/v1/users/{user_id}", headers=dict(admin, **{"If-None-Match": etag}))
+        return unchanged, changed
+
+    unchanged, changed = api(scenario)
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert changed.json()["name"] == "Renamed"
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from app.core import hashing
+from app.core.hashing import PasswordHasher
+
+def test_full_queue_is_shed_with_503(monkeypatch):
+    release = threading.Event()
+
+    def slow_hash(password: bytes) -> bytes:
+        release.wait(5)
+        return b"hashed"
+
+    monkeypatch.setattr(hashing, "_hashpw", slow_hash)
+    hasher = PasswordHasher(workers=1, mode="thread", max_pending=2)
+
+    async def run():
+        queued = [asyncio.ensure_future(hasher.hash("pw")) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as error:
+            await hasher.hash("pw")
+        release.set()
+        return error.value, await asyncio.gather(*queued)
+
+    try:
+        error, results = asyncio.run(run())
+    finally:
+        release.set()
+        hasher.shutdown()
+    assert error.status_code == 503
+    assert error.headers["Retry-After"]
+    assert results == ["hashed", "hashed"]
+    assert hasher.stats()["rejected"] == 1
+    assert hasher.stats()["queue_depth"] == 0
+
+def test_hash_and_verify():
+    hasher = PasswordHasher(workers=1, mode="thread", max_pending=4)
+
+    async def run():
+        hashed = await hasher.hash("secret")
+        return await hasher.verify("secret", hashed), await hasher.verify("wrong", hashed)
+
+    try:
+        assert asyncio.run(run()) == (True, False)
+    finally:
+        hasher.shutdown()
+
+def test_register_is_shed_when_hashing_is_saturated(api, monkeypatch):
+    from app.core.hashing import password_hasher
+    monkeypatch.setattr(password_hasher, "pending", password_hasher.max_pending)
+
+    async def scenario(client):
+        return await client.post("/api/v1/auth/register", json={"email": "busy@example.com", "password": "pw"})
+
+    response = api(scenario)
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
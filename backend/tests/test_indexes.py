@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from pymongo import ASCENDING
+from conftest import login
+from app.db.indexes import INDEXES, ensure_indexes, missing_indexes
+
+def test_create_builds_every_index(fake_db):
+    async def run():
+        await ensure_indexes(fake_db, "create")
+        return await missing_indexes(fake_db), await fake_db.users.index_information()
+
+    missing, users = asyncio.run(run())
+    assert missing == {}
+    assert {index.document["name"] for index in INDEXES["users"]} <= set(users)
+
+def test_existing_index_under_another_name_is_kept(fake_db):
+    async def run():
+        # What older deployments have, creating email_unique next to it would be rejected
+        await fake_db.users.create_index([("email", ASCENDING)], name="email_1", unique=True)
+        await ensure_indexes(fake_db, "create")
+        return await fake_db.users.index_information()
+
+    users = asyncio.run(run())
+    assert "email_1" in users
+    assert "email_unique" not in users
+    assert "created_at_id" in users
+
+@pytest.mark.parametrize("mode", ["verify", "off"])
+def test_startup_fails_without_the_unique_email_index(fake_db, mode):
+    with pytest.raises(RuntimeError, match="users"):
+        asyncio.run(ensure_indexes(fake_db, mode))
+
+def test_non_unique_email_index_is_not_enough(fake_db):
+    async def run():
+        await fake_db.users.create_index([("email", ASCENDING)], name="email_1")
+        await ensure_indexes(fake_db, "create")
+
+    with pytest.raises(RuntimeError, match="users"):
+        asyncio.run(run())
+
+def test_duplicate_registration_is_rejected(api):
+    async def scenario(client):
+        user = {"email": "user@example.com", "password": "pw", "name": "User"}
+        first = await client.post("/api/v1/auth/register", json=user)
+        second = await client.post("/api/v1/auth/register", json=dict(user, name="Other"))
+        return first, second
+
+    first, second = api(scenario)
+    assert first.status_code == 201
+    assert second.status_code == 400
+    assert second.json()["detail"] == "Email already registered"
+
+def test_duplicate_admin_create_is_rejected(api):
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", admin=True)
+        await login(client, "user@example.com")
+        return await client.post(
+            "/api/v1/users/", json={"email": "user@example.com", "password": "pw", "name": "Copy"}, headers=admin,
+        )
+
+    response = api(scenario)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"
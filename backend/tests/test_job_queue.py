@@ -0,0 +1,133 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from app.core.config import settings
+from app.core.job_queue import JobQueue
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_SECONDS", 0)
+    monkeypatch.setattr(settings, "JOB_POLL_SECONDS", 0.01)
+
+def queue(worker_id: str, max_attempts: int = 3) -> JobQueue:
+    job_queue = JobQueue(concurrency=1, max_attempts=max_attempts)
+    job_queue.worker_id = worker_id
+    return job_queue
+
+def flaky_handler(job_queue: JobQueue, failures: int) -> list:
+    calls = []
+
+    @job_queue.handler("flaky")
+    async def handle(db, job):
+        calls.append(job["attempts"])
+        if len(calls) <= failures:
+            raise ValueError(f"failure {len(calls)}")
+        return {"ok": True}
+
+    return calls
+
+async def run_claimed(job_queue: JobQueue, db) -> bool:
+    job = await job_queue._claim(db)
+    if job is None:
+        return False
+    await job_queue._execute(db, job)
+    return True
+
+def test_failed_jobs_are_retried_until_they_succeed(fake_db):
+    job_queue = queue("a")
+    calls = flaky_handler(job_queue, failures=2)
+
+    async def run():
+        job_id = await job_queue.enqueue(fake_db, "flaky", {})
+        while await run_claimed(job_queue, fake_db):
+            pass
+        return await job_queue.get(fake_db, job_id)
+
+    job = asyncio.run(run())
+    assert calls == [1, 2, 3]
+    assert job["status"] == "done"
+    assert job["result"] == {"ok": True}
+    assert job["last_error"] == "failure 2"
+    assert job_queue.stats()["retried"] == 2
+
+def test_jobs_fail_after_max_attempts(fake_db):
+    job_queue = queue("a", max_attempts=2)
+    calls = flaky_handler(job_queue, failures=5)
+
+    async def run():
+        job_id = await job_queue.enqueue(fake_db, "flaky", {})
+        while await run_claimed(job_queue, fake_db):
+            pass
+        return await job_queue.get(fake_db, job_id)
+
+    job = asyncio.run(run())
+    assert calls == [1, 2]
+    assert job["status"] == "failed"
+    assert job["last_error"] == "failure 2"
+
+def test_backoff_delays_the_retry(fake_db, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_RETRY_BASE_SECONDS", 60)
+    job_queue = queue("a")
+    flaky_handler(job_queue, failures=1)
+
+    async def run():
+        await job_queue.enqueue(fake_db, "flaky", {})
+        await run_claimed(job_queue, fake_db)
+        return await job_queue._claim(fake_db)
+
+    assert asyncio.run(run()) is None
+
+def test_expired_lease_is_reclaimed_and_the_old_holder_cannot_finish(fake_db):
+    stalled, rescuer = queue("stalled"), queue("rescuer")
+    done = []
+
+    @rescuer.handler("work")
+    async def handle(db, job):
+        done.append(job["attempts"])
+        return {"by": "rescuer"}
+
+    async def run():
+        job_id = await stalled.enqueue(fake_db, "work", {})
+        job = await stalled._claim(fake_db)
+        live = await rescuer._claim(fake_db)
+        # The stalled worker's lease runs out
+        await fake_db.jobs.update_one({"_id": job["_id"]}, {"$set": {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}})
+        reclaimed = await rescuer._claim(fake_db)
+        await stalled._finish(fake_db, job, {"$set": {"status": "failed", "last_error": "late"}})
+        await rescuer._execute(fake_db, reclaimed)
+        return live, reclaimed, await rescuer.get(fake_db, job_id)
+
+    live, reclaimed, job = asyncio.run(run())
+    assert live is None
+    assert reclaimed["worker"] == "rescuer"
+    assert done == [2]
+    assert job["status"] == "done"
+    assert job["result"] == {"by": "rescuer"}
+
+def test_consumer_survives_failures_recording_the_outcome(fake_db):
+    job_queue = queue("a")
+    calls = flaky_handler(job_queue, failures=0)
+    update_one = fake_db.jobs.update_one
+    failures = [2]
+
+    async def unreliable_update_one(*args, **kwargs):
+        if failures[0]:
+            failures[0] -= 1
+            raise ConnectionError("database unavailable")
+        return await update_one(*args, **kwargs)
+
+    async def run():
+        fake_db.jobs.update_one = unreliable_update_one
+        job_queue.start(fake_db)
+        for _ in range(3):
+            await job_queue.enqueue(fake_db, "flaky", {})
+        for _ in range(100):
+            if len(calls) == 3:
+                break
+            await asyncio.sleep(0.01)
+        alive = [not worker.done() for worker in job_queue._workers]
+        await job_queue.stop()
+        return alive
+
+    assert asyncio.run(run()) == [True]
+    assert len(calls) == 3
@@ -0,0 +1,48 @@
+import logging
+import subprocess
+import sys
+import pytest
+from app.utils import logger
+from app.utils.logger import RateLimitFilter
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(logger.time, "monotonic", lambda: now[0])
+    return now
+
+def record(level: int = logging.INFO, name: str = "app") -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, "message", None, None)
+
+def test_records_are_limited_per_logger(clock):
+    limit = RateLimitFilter(rate_per_second=2)
+    assert [limit.filter(record()) for _ in range(3)] == [True, True, False]
+    assert limit.filter(record(name="other"))
+    assert limit.filter(record(logging.WARNING))
+    clock[0] += 0.5
+    assert limit.filter(record())
+    assert limit.rate_limited == 1
+
+def test_fractional_rate_still_lets_records_through(clock):
+    limit = RateLimitFilter(rate_per_second=0.5)
+    assert limit.filter(record())
+    assert not limit.filter(record())
+    clock[0] += 1.9
+    assert not limit.filter(record())
+    clock[0] += 0.1
+    assert limit.filter(record())
+
+def test_uvicorn_logs_go_through_the_queue():
+    # A fresh interpreter, uvicorn and setup_logging both reconfigure logging globally
+    script = """
+import logging, uvicorn.config
+from app.utils.logger import setup_logging, shutdown_logging
+uvicorn.config.Config("app.main:app").configure_logging()
+setup_logging(json_output=True)
+logging.getLogger("uvicorn.access").info('%s - "%s %s HTTP/%s" %d', "1.2.3.4:5", "GET", "/", "1.1", 200)
+shutdown_logging()
+"""
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+    assert output.count("\n") == 1
+    assert '"logger":"uvicorn.access"' in output
+    assert 'GET / HTTP/1.1' in output
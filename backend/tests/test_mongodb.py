@@ -0,0 +1,11 @@
+from app.core.config import settings
+from app.db.mongodb import client_options
+
+def test_unset_options_keep_the_driver_defaults(monkeypatch):
+    monkeypatch.setattr(settings, "MONGODB_MAX_POOL_SIZE", 50)
+    monkeypatch.setattr(settings, "MONGODB_WAIT_QUEUE_TIMEOUT_MS", None)
+    monkeypatch.setattr(settings, "MONGODB_COMPRESSORS", "zstd,zlib")
+    options = client_options()
+    assert options["maxPoolSize"] == 50
+    assert options["compressors"] == "zstd,zlib"
+    assert "waitQueueTimeoutMS" not in options
@@ -0,0 +1,51 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_query, paginate
+
+def test_cursor_round_trip():
+    doc = {"created_at": datetime(2024, 5, 1, 12, 30, 15, 123456), "_id": ObjectId()}
+    assert decode_cursor(encode_cursor(doc)) == (doc["created_at"], doc["_id"])
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm8tc2VwYXJhdG9y", encode_cursor({"created_at": datetime(2024, 1, 1), "_id": "x"})])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor)
+    assert error.value.status_code == 400
+
+def test_keyset_query_without_cursor_is_unchanged():
+    assert keyset_query({"owner_id": "a"}, None) == {"owner_id": "a"}
+
+def test_pages_break_ties_on_id(fake_db):
+    # Several documents share a timestamp, the page boundaries fall in the middle of them
+    start = datetime(2024, 1, 1)
+    docs = [
+        {"_id": ObjectId(), "owner_id": "a", "created_at": start + timedelta(seconds=i // 3)}
+        for i in range(10)
+    ]
+    docs.append({"_id": ObjectId(), "owner_id": "b", "created_at": start})
+
+    async def walk():
+        await fake_db.tasks.insert_many(list(reversed(docs)))
+        pages, cursor = [], None
+        while True:
+            page, cursor = await paginate(fake_db.tasks, {"owner_id": "a"}, cursor, 4)
+            pages.append([doc["_id"] for doc in page])
+            if cursor is None:
+                return pages
+
+    pages = asyncio.run(walk())
+    expected = [doc["_id"] for doc in sorted(docs[:10], key=lambda doc: (doc["created_at"], doc["_id"]))]
+    assert [len(page) for page in pages] == [4, 4, 2]
+    assert [_id for page in pages for _id in page] == expected
+
+def test_last_full_page_has_no_cursor(fake_db):
+    async def run():
+        await fake_db.tasks.insert_many([{"created_at": datetime(2024, 1, 1)} for _ in range(3)])
+        return await paginate(fake_db.tasks, {}, None, 3)
+
+    page, cursor = asyncio.run(run())
+    assert len(page) == 3
+    assert cursor is None
@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime
+from bson import ObjectId
+from conftest import login
+from app.core.etag import RevisionTracker
+from app.core.principal_cache import PrincipalCache
+from app.core.task_cache import MemoryBackend
+from app.schemas.user import UserResponse
+
+def principal() -> UserResponse:
+    return UserResponse(_id=str(ObjectId()), email="user@example.com", role="USER", created_at=datetime(2024, 1, 1))
+
+def principal_cache(backend) -> PrincipalCache:
+    return PrincipalCache(maxsize=10, ttl=60, revisions=RevisionTracker(backend, "principal"))
+
+class UnavailableBackend(MemoryBackend):
+    """A backend whose revision reads fail, as RedisBackend reports an outage."""
+
+    def __init__(self):
+        super().__init__(10, 60)
+        self.available = True
+
+    async def version(self, key: str):
+        return await super().version(key) if self.available else None
+
+def test_principal_cached_before_an_invalidation_is_not_served():
+    cache = principal_cache(MemoryBackend(10, 60))
+    user = principal()
+
+    async def run():
+        # The revision is read before the lookup, and the user changes while it runs
+        revision = await cache.revision(user.id)
+        await cache.invalidate(user.id)
+        cache.set(user.id, revision, user)
+        stale = await cache.get(user.id)
+        cache.set(user.id, await cache.revision(user.id), user)
+        return stale, await cache.get(user.id)
+
+    stale, fresh = asyncio.run(run())
+    assert stale is None
+    assert cache.stale == 1
+    assert fresh == user
+
+def test_principal_revisions_are_shared_through_the_backend():
+    backend = MemoryBackend(10, 60)
+    worker_a = principal_cache(backend)
+    worker_b = principal_cache(backend)
+    user = principal()
+
+    async def run():
+        worker_b.set(user.id, await worker_b.revision(user.id), user)
+        await worker_a.invalidate(user.id)
+        return await worker_b.get(user.id)
+
+    assert asyncio.run(run()) is None
+
+def test_unavailable_revisions_are_a_miss():
+    backend = UnavailableBackend()
+    cache = principal_cache(backend)
+    user = principal()
+
+    async def run():
+        cache.set(user.id, await cache.revision(user.id), user)
+        backend.available = False
+        missed = await cache.get(user.id), await cache.revision(user.id)
+        backend.available = True
+        return missed, await cache.get(user.id)
+
+    missed, recovered = asyncio.run(run())
+    assert missed == (None, None)
+    assert cache.stale == 0
+    assert recovered == user
+
+def test_role_and_deletion_take_effect_on_the_next_request(api):
+    async def scenario(client):
+        from app.db.mongodb import mongodb
+        admin = await login(client, "admin@example.com", admin=True)
+        user = await login(client, "user@example.com")
+        user_id = str((await mongodb.db.users.find_one({"email": "user@example.com"}))["_id"])
+        # Loads the principal into the cache
+        before = await client.get("/api/v1/users/", headers=user)
+        await client.put(f"/api/v1/users/{user_id}", json={"role": "ADMIN"}, headers=admin)
+        promoted = await client.get("/api/v1/users/", headers=user)
+        await client.delete(f"/api/v1/users/{user_id}", headers=admin)
+        deleted = await client.get("/api/v1/tasks/", headers=user)
+        return before.status_code, promoted.status_code, deleted.status_code
+
+    assert api(scenario) == (403, 200, 404)
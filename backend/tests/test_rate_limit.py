@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from app.core import rate_limit
+from app.core.config import settings
+from app.core.rate_limit import LoginThrottle, MemoryBuckets, TokenBucket
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+def take(bucket: TokenBucket, key: str = "k", cost: int = 1) -> float:
+    return asyncio.run(bucket.take(key, cost))
+
+def test_burst_then_wait(clock):
+    bucket = TokenBucket(MemoryBuckets(100), "test", rate_per_minute=60, burst=3)
+    assert [take(bucket) for _ in range(3)] == [0, 0, 0]
+    assert take(bucket) == pytest.approx(1.0)
+    assert bucket.throttled == 1
+
+def test_refills_at_rate_up_to_burst(clock):
+    bucket = TokenBucket(MemoryBuckets(100), "test", rate_per_minute=60, burst=3)
+    for _ in range(3):
+        take(bucket)
+    clock[0] += 0.5
+    assert take(bucket) == pytest.approx(0.5)
+    clock[0] += 0.5
+    assert take(bucket) == 0
+    # A long pause refills to the burst, not beyond it
+    clock[0] += 3600
+    assert [take(bucket) for _ in range(4)][-1] > 0
+
+def test_zero_cost_only_checks(clock):
+    bucket = TokenBucket(MemoryBuckets(100), "test", rate_per_minute=60, burst=1)
+    assert take(bucket, cost=0) == 0
+    assert take(bucket, cost=0) == 0
+    assert take(bucket) == 0
+    assert take(bucket, cost=0) > 0
+
+def test_keys_are_independent_and_reset(clock):
+    bucket = TokenBucket(MemoryBuckets(100), "test", rate_per_minute=60, burst=1)
+    take(bucket, "a")
+    assert take(bucket, "a") > 0
+    assert take(bucket, "b") == 0
+    asyncio.run(bucket.reset("a"))
+    assert take(bucket, "a") == 0
+
+def test_least_recently_used_keys_are_evicted(clock):
+    buckets = MemoryBuckets(maxsize=2)
+    bucket = TokenBucket(buckets, "test", rate_per_minute=60, burst=1)
+    for key in "abc":
+        take(bucket, key)
+    assert buckets.stats()["keys"] == 2
+    # "a" was evicted, so it starts with a full bucket again
+    assert take(bucket, "a") == 0
+
+def test_zero_rate_disables(clock):
+    bucket = TokenBucket(MemoryBuckets(100), "test", rate_per_minute=0, burst=1)
+    assert [take(bucket) for _ in range(5)] == [0] * 5
+
+def throttle(monkeypatch, trusted_proxies) -> LoginThrottle:
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", trusted_proxies)
+    monkeypatch.setattr(settings, "LOGIN_IP_RATE_PER_MINUTE", 60)
+    monkeypatch.setattr(settings, "LOGIN_IP_BURST", 2)
+    monkeypatch.setattr(settings, "LOGIN_ACCOUNT_BURST", 2)
+    return LoginThrottle(MemoryBuckets(100), max_concurrent=0)
+
+def attempts(login_throttle: LoginThrottle, accounts: list[str], ip: str = "10.0.0.1") -> list[int]:
+    async def run():
+        statuses = []
+        for account in accounts:
+            try:
+                await login_throttle.check(account, ip)
+                statuses.append(200)
+            except HTTPException as e:
+                statuses.append(e.status_code)
+        return statuses
+    return asyncio.run(run())
+
+def test_ip_buckets_need_trusted_proxies(clock, monkeypatch):
+    assert attempts(throttle(monkeypatch, None), ["a", "b", "c"]) == [200, 200, 200]
+    assert attempts(throttle(monkeypatch, "10.0.0.0/8"), ["a", "b", "c"]) == [200, 200, 429]
+
+def test_accounts_are_only_drained_by_failures(clock, monkeypatch):
+    login_throttle = throttle(monkeypatch, None)
+    assert attempts(login_throttle, ["user"] * 5) == [200] * 5
+
+    async def fail(times: int):
+        for _ in range(times):
+            await login_throttle.failed("User ")
+
+    asyncio.run(fail(2))
+    assert attempts(login_throttle, ["user"]) == [429]
+    asyncio.run(login_throttle.succeeded("user"))
+    assert attempts(login_throttle, ["user"]) == [200]
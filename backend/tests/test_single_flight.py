@@ -0,0 +1,118 @@
+import asyncio
+from app.core.config import settings
+from app.core.single_flight import SingleFlight
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", load) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["value"] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"calls": 5, "coalesced": 4, "in_flight": 0}
+
+def test_error_reaches_every_caller_and_is_not_kept():
+    flight = SingleFlight()
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("lookup failed")
+
+    async def succeed():
+        return "value"
+
+    async def run():
+        results = await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+        # The failed call is forgotten, the next one runs again
+        return results, await flight.do("key", succeed)
+
+    results, retried = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) and str(result) == "lookup failed" for result in results)
+    assert retried == "value"
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    flight = SingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.02)
+        return "value"
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("key", load))
+        second = asyncio.ensure_future(flight.do("key", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "value"
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(flight.do("a", load), flight.do("b", load))
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+def test_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "SINGLE_FLIGHT", False)
+    flight = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(flight.do("key", load), flight.do("key", load))
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+def test_user_lookups_are_shared_until_a_local_write(monkeypatch):
+    from datetime import datetime
+    from bson import ObjectId
+    from app.core import dependencies
+    from app.core.principal_cache import principal_cache
+    from app.core.security import create_access_token
+    from app.schemas.user import UserResponse
+
+    # As with several workers and per-process revisions, lookups can't be checked against a revision
+    monkeypatch.setattr(principal_cache, "enabled", False)
+    user_id = str(ObjectId())
+    loads = []
+
+    async def load_principal(db, user_id, revision):
+        loads.append(revision)
+        await asyncio.sleep(0.02)
+        return UserResponse(_id=user_id, email="user@example.com", role="USER", created_at=datetime(2024, 1, 1))
+
+    monkeypatch.setattr(dependencies, "load_principal", load_principal)
+    token = create_access_token(user_id)
+
+    async def run():
+        before = [asyncio.ensure_future(dependencies.resolve_current_user(token, None)) for _ in range(3)]
+        await asyncio.sleep(0)
+        await principal_cache.invalidate(user_id)
+        after = asyncio.ensure_future(dependencies.resolve_current_user(token, None))
+        return await asyncio.gather(*before, after)
+
+    users = asyncio.run(run())
+    assert len(loads) == 2
+    assert {user.id for user in users} == {user_id}
@@ -0,0 +1,91 @@
+import asyncio
+import pytest
+from conftest import login
+from app.core.config import settings
+from app.core.task_cache import MemoryBackend, TaskListCache
+
+@pytest.fixture
+def unreachable_redis(monkeypatch):
+    pytest.importorskip("redis")
+    from app.core.task_cache import RedisBackend
+    monkeypatch.setattr(settings, "REDIS_TIMEOUT_SECONDS", 0.2)
+    # Nothing listens on port 1, connections are refused right away
+    return RedisBackend("redis://127.0.0.1:1/0", ttl=30)
+
+def test_task_pages_are_dropped_when_the_version_bumps():
+    tasks = TaskListCache(MemoryBackend(100, 60))
+
+    async def run():
+        version = await tasks.version("owner")
+        await tasks.set("owner", version, None, 10, b"[]", "next")
+        cached = await tasks.get("owner", version, None, 10)
+        await tasks.invalidate("owner")
+        new_version = await tasks.version("owner")
+        return cached, new_version != version, await tasks.get("owner", new_version, None, 10)
+
+    cached, bumped, after = asyncio.run(run())
+    assert cached == (b"[]", "next")
+    assert bumped
+    assert after is None
+
+def test_nothing_is_cached_without_a_backend():
+    tasks = TaskListCache(None)
+
+    async def run():
+        version = await tasks.version("owner")
+        await tasks.set("owner", version, None, 10, b"[]", None)
+        return version, await tasks.get("owner", version, None, 10)
+
+    assert asyncio.run(run()) == (None, None)
+
+def test_unreachable_redis_is_a_miss(unreachable_redis):
+    async def run():
+        await unreachable_redis.set("key", b"value")
+        await unreachable_redis.bump("tasks:owner")
+        return await unreachable_redis.get("key"), await unreachable_redis.version("tasks:owner")
+
+    assert asyncio.run(run()) == (None, None)
+    assert not unreachable_redis.available
+    assert unreachable_redis.failures == 4
+
+def test_redis_versions_expire():
+    fakeredis = pytest.importorskip("fakeredis")
+    from app.core.task_cache import RedisBackend
+    backend = RedisBackend("redis://localhost:6379/0", ttl=30)
+    backend._redis = fakeredis.FakeAsyncRedis()
+
+    async def run():
+        version = await backend.version("tasks:owner")
+        ttl = await backend._redis.ttl("version:tasks:owner")
+        await backend.bump("tasks:owner")
+        return version, await backend.version("tasks:owner"), ttl, await backend._redis.ttl("version:tasks:owner")
+
+    version, bumped, ttl, bumped_ttl = asyncio.run(run())
+    assert bumped != version
+    assert 0 < ttl <= 30
+    assert 0 < bumped_ttl <= 30
+
+def test_requests_fall_through_to_the_database_while_redis_is_down(api, unreachable_redis, monkeypatch):
+    from app.core.etag import user_revisions
+    from app.core.principal_cache import principal_cache
+    from app.core.task_cache import task_list_cache
+    monkeypatch.setattr(task_list_cache, "backend", unreachable_redis)
+    monkeypatch.setattr(user_revisions, "backend", unreachable_redis)
+    monkeypatch.setattr(principal_cache.revisions, "backend", unreachable_redis)
+
+    async def scenario(client):
+        from app.db.mongodb import mongodb
+        user = await login(client, "user@example.com")
+        user_id = str((await mongodb.db.users.find_one({"email": "user@example.com"}))["_id"])
+        created = await client.post("/api/v1/tasks/", json={"title": "Task"}, headers=user)
+        tasks = await client.get("/api/v1/tasks/", headers=user)
+        profile = await client.get(f"/api/v1/users/{user_id}", headers=user)
+        return created, tasks, profile
+
+    created, tasks, profile = api(scenario)
+    assert created.status_code == 201
+    assert tasks.status_code == 200
+    assert [task["title"] for task in tasks.json()] == ["Task"]
+    assert "ETag" not in tasks.headers
+    assert profile.status_code == 200
+    assert "ETag" not in profile.headers
@@ -0,0 +1,34 @@
+from datetime import timedelta
+import pytest
+from jose import JWTError
+from app.core import cache, security
+from app.core.security import create_access_token, decode_access_token
+
+def test_verified_payloads_are_cached(monkeypatch):
+    token = create_access_token("user", timedelta(minutes=5))
+    payload = decode_access_token(token)
+    # A cached token isn't decoded again
+    monkeypatch.setattr(security.jwt, "decode", lambda *args, **kwargs: pytest.fail("decoded twice"))
+    assert decode_access_token(token) == payload
+
+def test_cached_payloads_expire_with_the_token(monkeypatch):
+    token = create_access_token("user", timedelta(seconds=30))
+    decode_access_token(token)
+    decoded = []
+
+    def decode(*args, **kwargs):
+        decoded.append(token)
+        raise JWTError("Signature has expired")
+
+    now = cache.time.monotonic()
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now + 31)
+    monkeypatch.setattr(security.jwt, "decode", decode)
+    with pytest.raises(JWTError):
+        decode_access_token(token)
+    assert decoded == [token]
+
+def test_invalid_tokens_are_not_cached():
+    token = create_access_token("user", timedelta(minutes=5))[:-2] + "xx"
+    for _ in range(2):
+        with pytest.raises(JWTError):
+            decode_access_token(token)
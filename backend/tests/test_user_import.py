@@ -0,0 +1,116 @@
+import asyncio
+import io
+import json
+from datetime import datetime
+import bcrypt
+import pytest
+from conftest import login
+from app.core.config import Settings, settings
+from app.core.job_queue import job_queue
+from app.utils import user_import
+from app.utils.user_import import UserImport, import_hash_workers
+
+async def run_import(client, headers, body: bytes, fmt: str = "ndjson") -> dict:
+    response = await client.post(f"/api/v1/users/import?format={fmt}", content=body, headers=headers)
+    assert response.status_code == 202
+    for _ in range(500):
+        job = (await client.get(f"/api/v1/users/import/{response.json()['job_id']}", headers=headers)).json()
+        if job["status"] != "running":
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError("Import did not finish")
+
+def test_ndjson_rows_are_validated_per_line(api):
+    lines = [
+        json.dumps({"email": "new@example.com", "password": "pw", "name": "New"}),
+        "",
+        "{not json",
+        json.dumps(["not", "an", "object"]),
+        json.dumps({"email": "no-at-sign", "password": "pw"}),
+        json.dumps({"email": "nopassword@example.com"}),
+        json.dumps({"email": "admin@example.com", "password": "pw"}),
+        json.dumps({"email": "new@example.com", "password": "pw"}),
+    ]
+
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", admin=True)
+        job = await run_import(client, admin, "\n".join(lines).encode())
+        imported = await client.post("/api/v1/auth/login", data={"username": "new@example.com", "password": "pw"})
+        return job, imported.status_code
+
+    job, login_status = api(scenario)
+    result = job["result"]
+    assert job["status"] == "done"
+    assert (result["lines"], result["inserted"], result["duplicates"], result["invalid"]) == (7, 1, 2, 4)
+    errors = {error["line"]: error for error in result["errors"]}
+    assert errors[3]["detail"].startswith("Invalid JSON")
+    assert errors[4]["detail"] == "Expected a JSON object"
+    assert errors[5]["detail"].startswith("email:")
+    assert "Exactly one of password or hashed_password" in errors[6]["detail"]
+    assert errors[7]["error"] == errors[8]["error"] == "duplicate"
+    assert login_status == 200
+
+def test_csv_rows_with_existing_hashes(api):
+    hashed = bcrypt.hashpw(b"secret", bcrypt.gensalt(4)).decode()
+    body = (
+        "email,name,permissions,password,hashed_password\n"
+        f"csv@example.com,Csv,read;write,,{hashed}\n"
+        "short@example.com,Short,,,$2b$04$tooshort\n"
+    ).encode()
+
+    async def scenario(client):
+        from app.db.mongodb import mongodb
+        admin = await login(client, "admin@example.com", admin=True)
+        job = await run_import(client, admin, body, fmt="csv")
+        user = await mongodb.db.users.find_one({"email": "csv@example.com"})
+        imported = await client.post("/api/v1/auth/login", data={"username": "csv@example.com", "password": "secret"})
+        return job, user, imported.status_code
+
+    job, user, login_status = api(scenario)
+    assert (job["result"]["inserted"], job["result"]["invalid"]) == (1, 1)
+    assert job["result"]["errors"][0]["line"] == 3
+    assert user["permissions"] == ["read", "write"]
+    assert user["hashed_password"] == hashed
+    assert login_status == 200
+
+def test_oversized_uploads_are_rejected(api, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_BYTES", 10)
+
+    async def scenario(client):
+        admin = await login(client, "admin@example.com", admin=True)
+        return await client.post("/api/v1/users/import", content=b"x" * 11, headers=admin)
+
+    assert api(scenario).status_code == 413
+
+def test_lease_is_extended_while_waiting_for_another_import(fake_db, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_LEASE_SECONDS", 0.3)
+    monkeypatch.setattr(job_queue, "worker_id", "importer")
+
+    async def run():
+        result = await fake_db.jobs.insert_one({"status": "running", "worker": "importer", "lease_expires_at": datetime.utcnow()})
+        job = {"_id": result.inserted_id}
+        await user_import._import_lock.acquire()
+        try:
+            waiting = asyncio.ensure_future(UserImport(io.BytesIO(b'{"email": "bad"}\n'), "ndjson").run(fake_db, job))
+            await asyncio.sleep(0.25)
+            lease = (await fake_db.jobs.find_one({"_id": job["_id"]}))["lease_expires_at"]
+        finally:
+            user_import._import_lock.release()
+        return lease, await waiting
+
+    lease, result = asyncio.run(run())
+    assert lease > datetime.utcnow()
+    assert result["invalid"] == 1
+
+@pytest.mark.parametrize("cpus, workers, configured, expected", [
+    (8, 1, None, 7),
+    (8, 0, None, 1),
+    (8, 2, None, 3),
+    (1, 1, None, 1),
+    (8, 0, 2, 2),
+])
+def test_hash_pool_is_split_between_server_processes(monkeypatch, cpus, workers, configured, expected):
+    monkeypatch.setattr(Settings, "cpu_count", lambda self: cpus)
+    monkeypatch.setattr(settings, "WORKERS", workers)
+    monkeypatch.setattr(settings, "IMPORT_HASH_WORKERS", configured)
+    assert import_hash_workers() == expected